@@ -2,18 +2,78 @@
 Tool executor agent - calls educational tool APIs.
 """
 import os
+import asyncio
 import logging
 import time
 import httpx
-from typing import Dict, Any
+import orjson
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from models.schemas import ToolType, ToolResponse
+from utils.ttl_cache import TTLCache, cache_key
 
 logger = logging.getLogger(__name__)
 
+# Map tool type to endpoint (resolved once at import)
+_TOOL_SERVICE_URL = os.getenv("TOOL_SERVICE_URL", "http://localhost:8001")
+TOOL_ENDPOINTS = {
+    ToolType.NOTE_MAKER: f"{_TOOL_SERVICE_URL}/api/note-maker",
+    ToolType.FLASHCARD_GENERATOR: f"{_TOOL_SERVICE_URL}/api/flashcard-generator",
+    ToolType.CONCEPT_EXPLAINER: f"{_TOOL_SERVICE_URL}/api/concept-explainer"
+}
+
+_JSON_HEADERS = {"content-type": "application/json"}
+_READ_CHUNK_SIZE = 65536
+
+# Static failure payloads - built via model_construct (trusted, no validation)
+_INVALID_TOOL_ERR = {"success": False, "error": "Invalid tool type"}
+_TIMEOUT_ERR = {"success": False, "error": "Tool execution timeout"}
+
+# Short-lived cache of successful tool responses, keyed by tool + input hash
+_CACHE_TTL_SECONDS = float(os.getenv("TOOL_CACHE_TTL_SECONDS", "300"))
+_cache: TTLCache[ToolResponse] = TTLCache(maxsize=256, ttl=_CACHE_TTL_SECONDS)
+# In-flight calls, so concurrent identical requests share one HTTP call
+_inflight: Dict[str, "asyncio.Task[ToolResponse]"] = {}
+
+# Caps concurrent calls to the tool service. Kept below the client's
+# connection limit so excess calls queue here rather than in the pool.
+_call_slots = asyncio.Semaphore(int(os.getenv("TOOL_CONCURRENCY", "32")))
+
+# Shared HTTP client - reuses keep-alive connections to the tool service
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use.
+    
+    Returns:
+        Process-wide httpx.AsyncClient with a keep-alive connection pool
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=60.0,  # Tool generation can take a while
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=30.0
+            )
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared HTTP client (called on application shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def execute_tool(
     tool_type: ToolType,
@@ -22,6 +82,9 @@ async def execute_tool(
     """
     Execute educational tool by calling its API endpoint.
     
+    Identical requests are served from a short TTL cache, and concurrent
+    duplicates are coalesced onto a single in-flight call.
+    
     Args:
         tool_type: Which tool to execute
         tool_input: Validated input parameters
@@ -29,63 +92,92 @@ async def execute_tool(
     Returns:
         ToolResponse with results or error
     """
-    logger.info(f"Executing tool: {tool_type.value}")
+    logger.info("Executing tool: %s", tool_type.value)
     
-    start_time = time.time()
+    endpoint = TOOL_ENDPOINTS.get(tool_type)
+    if not endpoint:
+        logger.error("No endpoint found for tool: %s", tool_type)
+        return ToolResponse.model_construct(tool_type=tool_type, **_INVALID_TOOL_ERR)
     
-    # Map tool type to endpoint
-    tool_service_url = os.getenv("TOOL_SERVICE_URL", "http://localhost:8001")
-    endpoints = {
-        ToolType.NOTE_MAKER: f"{tool_service_url}/api/note-maker",
-        ToolType.FLASHCARD_GENERATOR: f"{tool_service_url}/api/flashcard-generator",
-        ToolType.CONCEPT_EXPLAINER: f"{tool_service_url}/api/concept-explainer"
-    }
+    key = cache_key(tool_type.value, tool_input)
     
-    endpoint = endpoints.get(tool_type)
-    if not endpoint:
-        logger.error(f"No endpoint found for tool: {tool_type}")
-        return ToolResponse(
-            tool_type=tool_type,
-            success=False,
-            error="Invalid tool type"
-        )
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.info("Tool cache hit: %s", tool_type.value)
+        return cached
+    
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_call_and_cache(key, tool_type, endpoint, tool_input))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        logger.info("Joining in-flight tool call: %s", tool_type.value)
+    
+    # Shield so one cancelled caller doesn't cancel the call for the others
+    return await asyncio.shield(task)
+
+
+async def _call_and_cache(
+    key: str,
+    tool_type: ToolType,
+    endpoint: str,
+    tool_input: Dict[str, Any]
+) -> ToolResponse:
+    """Call the tool and cache the response if it succeeded."""
+    async with _call_slots:
+        response = await _call_tool(tool_type, endpoint, tool_input)
+    if response.success:
+        _cache.set(key, response)
+    return response
+
+
+async def _call_tool(
+    tool_type: ToolType,
+    endpoint: str,
+    tool_input: Dict[str, Any]
+) -> ToolResponse:
+    """POST the tool input to its endpoint and wrap the result."""
+    start_time = time.time()
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:  # Increased timeout to 60 seconds
-            response = await client.post(endpoint, json=tool_input)
-            
-            execution_time = int((time.time() - start_time) * 1000)
-            
-            if response.status_code == 200:
-                data = response.json()
-                logger.info(f"Tool executed successfully in {execution_time}ms")
-                
-                return ToolResponse(
-                    tool_type=tool_type,
-                    success=True,
-                    data=data,
-                    execution_time_ms=execution_time
-                )
-            else:
-                logger.error(f"Tool returned error: {response.status_code}")
+        client = get_client()
+        async with client.stream(
+            "POST",
+            endpoint,
+            content=orjson.dumps(tool_input),
+            headers=_JSON_HEADERS
+        ) as response:
+            if response.status_code != 200:
+                # Error bodies are never used - don't download them
+                execution_time = int((time.time() - start_time) * 1000)
+                logger.error("Tool returned error: %s", response.status_code)
                 return ToolResponse(
                     tool_type=tool_type,
                     success=False,
                     error=f"Tool API error: {response.status_code}",
                     execution_time_ms=execution_time
                 )
-                
-    except httpx.TimeoutException:
-        logger.error("Tool execution timeout")
+            
+            # Accumulate into one buffer and parse it in place
+            body = bytearray()
+            async for chunk in response.aiter_bytes(_READ_CHUNK_SIZE):
+                body.extend(chunk)
+        
+        data = orjson.loads(body)
+        execution_time = int((time.time() - start_time) * 1000)
+        logger.info("Tool executed successfully in %sms", execution_time)
+        
         return ToolResponse(
             tool_type=tool_type,
-            success=False,
-            error="Tool execution timeout"
+            success=True,
+            data=data,
+            execution_time_ms=execution_time
         )
+                
+    except httpx.TimeoutException:
+        logger.error("Tool execution timeout")
+        return ToolResponse.model_construct(tool_type=tool_type, **_TIMEOUT_ERR)
     except Exception as e:
-        logger.error(f"Tool execution error: {e}")
-        return ToolResponse(
-            tool_type=tool_type,
-            success=False,
-            error=str(e)
-        )
+        logger.error("Tool execution error: %s", e)
+        return ToolResponse.model_construct(tool_type=tool_type, success=False, error=str(e))
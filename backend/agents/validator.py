@@ -2,7 +2,8 @@
 Validator agent for parameter validation against tool schemas.
 """
 import logging
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Callable, Type, get_args
+from pydantic import BaseModel, ValidationError
 
 from models.schemas import (
     ToolType,
@@ -15,8 +16,62 @@ from models.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Pre-bound Pydantic serializers (resolved once at import). Tool inputs whose
+# LLM-provided fields pass the type checks below are built with
+# model_construct: user_info/chat_history were validated at the API boundary.
+# Anything else goes through full model_validate.
+_NM_DUMP = NoteMakerInput.__pydantic_serializer__.to_python
+_FC_DUMP = FlashcardGeneratorInput.__pydantic_serializer__.to_python
+_CE_DUMP = ConceptExplainerInput.__pydantic_serializer__.to_python
 
-async def validate_parameters(
+# Allowed values of the Literal fields, read from the schemas
+_NOTE_STYLES = frozenset(get_args(NoteMakerInput.model_fields["note_taking_style"].annotation))
+_DIFFICULTIES = frozenset(get_args(FlashcardGeneratorInput.model_fields["difficulty"].annotation))
+_DEPTHS = frozenset(get_args(ConceptExplainerInput.model_fields["desired_depth"].annotation))
+
+# Required parameters per tool (ordered - drives clarification prompts)
+_NM_REQUIRED = ("topic", "subject", "note_taking_style")
+_FC_REQUIRED = ("topic", "count", "difficulty", "subject")
+_CE_REQUIRED = ("concept_to_explain", "current_topic", "desired_depth")
+
+
+def _find_missing(params: Dict[str, Any], required: Tuple[str, ...]) -> List[str]:
+    """Return required fields that are absent or empty, in declaration order."""
+    return [field for field in required if not params.get(field)]
+
+
+def _is_one_of(value: Any, allowed: frozenset) -> bool:
+    """Whether value is one of a Literal field's allowed strings."""
+    return isinstance(value, str) and value in allowed
+
+
+def _build_input(
+    model: Type[BaseModel],
+    dump: Callable[..., Dict[str, Any]],
+    fields: Dict[str, Any],
+    checked: bool
+) -> Tuple[bool, Optional[Dict[str, Any]], List[str]]:
+    """
+    Build a tool input dict from already-checked or unchecked fields.
+    
+    When the LLM-provided fields passed the fast type checks (`checked`),
+    the model is constructed without validation. Otherwise model_validate
+    runs: it coerces what it can (e.g. count "5" -> 5) and the fields it
+    rejects are returned as invalid, so the user is asked about them.
+    """
+    if checked:
+        return True, dump(model.model_construct(**fields), warnings=False), []
+    
+    try:
+        tool_input = model.model_validate(fields)
+    except ValidationError as e:
+        invalid = list(dict.fromkeys(str(error["loc"][0]) for error in e.errors() if error["loc"]))
+        logger.warning("%s validation failed for: %s", model.__name__, invalid)
+        return False, None, invalid or ["validation_failed"]
+    return True, dump(tool_input, warnings=False), []
+
+
+def validate_parameters(
     tool_type: ToolType,
     parameters: Dict[str, Any],
     user_info: UserInfo,
@@ -38,121 +93,138 @@ async def validate_parameters(
     if isinstance(tool_type, str):
         tool_type = ToolType(tool_type)
     
-    logger.info(f"Validating parameters for {tool_type.value}")
-    logger.info(f"Parameters received: {parameters}")
+    logger.info("Validating parameters for %s", tool_type.value)
+    logger.info("Parameters received: %s", parameters)
     
     try:
-        if tool_type == ToolType.NOTE_MAKER:
-            return await _validate_note_maker(parameters, user_info, chat_history)
-        elif tool_type == ToolType.FLASHCARD_GENERATOR:
-            return await _validate_flashcard(parameters, user_info)
-        else:  # CONCEPT_EXPLAINER
-            return await _validate_concept_explainer(parameters, user_info, chat_history)
-            
+        return _VALIDATORS[tool_type](parameters, user_info, chat_history)
+        
     except Exception as e:
-        logger.error(f"Validation error: {e}", exc_info=True)
+        logger.error("Validation error: %s", e, exc_info=True)
         return False, None, ["validation_error"]
 
 
-async def _validate_note_maker(
+def _validate_note_maker(
     params: Dict[str, Any],
     user_info: UserInfo,
     chat_history: List[ChatMessage]
 ) -> Tuple[bool, Optional[Dict[str, Any]], List[str]]:
     """Validate Note Maker parameters."""
     
-    required = ["topic", "subject", "note_taking_style"]
-    missing = [field for field in required if not params.get(field)]
+    missing = _find_missing(params, _NM_REQUIRED)
     
     if missing:
-        logger.warning(f"Note Maker missing required params: {missing}")
+        logger.warning("Note Maker missing required params: %s", missing)
         return False, None, missing
     
     try:
-        # Build tool input
-        tool_input = NoteMakerInput(
-            user_info=user_info,
-            chat_history=chat_history,
-            topic=params["topic"],
-            subject=params["subject"],
-            note_taking_style=params["note_taking_style"],
-            include_examples=params.get("include_examples", True),
-            include_analogies=params.get("include_analogies", False)
+        fields = {
+            "user_info": user_info,
+            "chat_history": chat_history,
+            "topic": params["topic"],
+            "subject": params["subject"],
+            "note_taking_style": params["note_taking_style"],
+            "include_examples": params.get("include_examples", True),
+            "include_analogies": params.get("include_analogies", False)
+        }
+        checked = (
+            isinstance(fields["topic"], str)
+            and isinstance(fields["subject"], str)
+            and _is_one_of(fields["note_taking_style"], _NOTE_STYLES)
+            and isinstance(fields["include_examples"], bool)
+            and isinstance(fields["include_analogies"], bool)
         )
         
-        logger.info("Note Maker validation passed")
-        return True, tool_input.model_dump(), []
+        result = _build_input(NoteMakerInput, _NM_DUMP, fields, checked)
+        if result[0]:
+            logger.info("Note Maker validation passed")
+        return result
         
     except Exception as e:
-        logger.error(f"Note Maker validation failed: {e}")
+        logger.error("Note Maker validation failed: %s", e)
         return False, None, ["validation_failed"]
 
 
-async def _validate_flashcard(
+def _validate_flashcard(
     params: Dict[str, Any],
     user_info: UserInfo
 ) -> Tuple[bool, Optional[Dict[str, Any]], List[str]]:
     """Validate Flashcard Generator parameters."""
     
-    required = ["topic", "count", "difficulty", "subject"]
-    missing = [field for field in required if not params.get(field)]
+    missing = _find_missing(params, _FC_REQUIRED)
     
     if missing:
-        logger.warning(f"Flashcard missing required params: {missing}")
+        logger.warning("Flashcard missing required params: %s", missing)
         return False, None, missing
     
     try:
-        # Validate count range
-        count = params["count"]
-        if not isinstance(count, int) or not (1 <= count <= 20):
-            logger.error(f"Invalid count: {count}")
-            return False, None, ["count"]
-        
-        # Build tool input
-        tool_input = FlashcardGeneratorInput(
-            user_info=user_info,
-            topic=params["topic"],
-            count=count,
-            difficulty=params["difficulty"],
-            subject=params["subject"],
-            include_examples=params.get("include_examples", True)
+        fields = {
+            "user_info": user_info,
+            "topic": params["topic"],
+            "count": params["count"],
+            "difficulty": params["difficulty"],
+            "subject": params["subject"],
+            "include_examples": params.get("include_examples", True)
+        }
+        count = fields["count"]
+        checked = (
+            isinstance(fields["topic"], str)
+            and isinstance(fields["subject"], str)
+            and isinstance(count, int) and 1 <= count <= 20
+            and _is_one_of(fields["difficulty"], _DIFFICULTIES)
+            and isinstance(fields["include_examples"], bool)
         )
         
-        logger.info("Flashcard validation passed")
-        return True, tool_input.model_dump(), []
+        result = _build_input(FlashcardGeneratorInput, _FC_DUMP, fields, checked)
+        if result[0]:
+            logger.info("Flashcard validation passed")
+        return result
         
     except Exception as e:
-        logger.error(f"Flashcard validation failed: {e}")
+        logger.error("Flashcard validation failed: %s", e)
         return False, None, ["validation_failed"]
 
 
-async def _validate_concept_explainer(
+def _validate_concept_explainer(
     params: Dict[str, Any],
     user_info: UserInfo,
     chat_history: List[ChatMessage]
 ) -> Tuple[bool, Optional[Dict[str, Any]], List[str]]:
     """Validate Concept Explainer parameters."""
     
-    required = ["concept_to_explain", "current_topic", "desired_depth"]
-    missing = [field for field in required if not params.get(field)]
+    missing = _find_missing(params, _CE_REQUIRED)
     
     if missing:
-        logger.warning(f"Concept Explainer missing required params: {missing}")
+        logger.warning("Concept Explainer missing required params: %s", missing)
         return False, None, missing
     
     try:
-        # Build tool input
-        tool_input = ConceptExplainerInput(
-            user_info=user_info,
-            chat_history=chat_history,
-            concept_to_explain=params["concept_to_explain"],
-            current_topic=params["current_topic"],
-            desired_depth=params["desired_depth"]
+        fields = {
+            "user_info": user_info,
+            "chat_history": chat_history,
+            "concept_to_explain": params["concept_to_explain"],
+            "current_topic": params["current_topic"],
+            "desired_depth": params["desired_depth"]
+        }
+        checked = (
+            isinstance(fields["concept_to_explain"], str)
+            and isinstance(fields["current_topic"], str)
+            and _is_one_of(fields["desired_depth"], _DEPTHS)
         )
         
-        logger.info("Concept Explainer validation passed")
-        return True, tool_input.model_dump(), []
+        result = _build_input(ConceptExplainerInput, _CE_DUMP, fields, checked)
+        if result[0]:
+            logger.info("Concept Explainer validation passed")
+        return result
         
     except Exception as e:
-        logger.error(f"Concept Explainer validation failed: {e}")
+        logger.error("Concept Explainer validation failed: %s", e)
         return False, None, ["validation_failed"]
+
+
+# Tool type -> validator dispatch table (all take params, user_info, chat_history)
+_VALIDATORS = {
+    ToolType.NOTE_MAKER: _validate_note_maker,
+    ToolType.FLASHCARD_GENERATOR: lambda params, user_info, _chat_history: _validate_flashcard(params, user_info),
+    ToolType.CONCEPT_EXPLAINER: _validate_concept_explainer
+}
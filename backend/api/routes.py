@@ -1,27 +1,97 @@
 """
 FastAPI routes for the AI Tutor Orchestrator.
 """
+import asyncio
 import logging
 import uuid
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import Dict, Any
+import orjson
+from uuid6 import uuid7
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends
+from fastapi.responses import ORJSONResponse, Response
+from typing import Dict, Any, List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.schemas import ChatRequest, ChatResponse, ToolResponse
+from models.schemas import ChatRequest, ChatResponse, ToolResponse, UserInfo
 from graph.orchestrator import orchestrate
-from database import get_db
+from database import get_db, async_session_maker
 from database.repositories import UserRepository, ConversationRepository, MessageRepository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Profiles already persisted by this process (user_id -> UserInfo).
+# Known users skip the upsert on the request path; profile changes are
+# written by a background task after the response is sent.
+_known_users: Dict[str, UserInfo] = {}
+_KNOWN_USERS_MAX = 10000
 
-@router.post("/chat", response_model=ChatResponse)
+
+def _user_fields(user_info: UserInfo) -> Dict[str, Any]:
+    """Map a UserInfo profile to UserRepository keyword arguments."""
+    return {
+        "user_id": uuid.UUID(user_info.user_id),
+        "name": user_info.name,
+        "grade_level": user_info.grade_level,
+        "learning_style_summary": user_info.learning_style_summary,
+        "emotional_state_summary": user_info.emotional_state_summary,
+        "mastery_level_summary": user_info.mastery_level_summary,
+        "teaching_style": user_info.teaching_style.value if hasattr(user_info.teaching_style, 'value') else user_info.teaching_style
+    }
+
+
+def _remember_user(user_info: UserInfo) -> None:
+    """Record a persisted profile, evicting the oldest entry when full."""
+    if user_info.user_id not in _known_users and len(_known_users) >= _KNOWN_USERS_MAX:
+        _known_users.pop(next(iter(_known_users)))
+    _known_users[user_info.user_id] = user_info
+
+
+async def _persist_user_profile(user_info: UserInfo) -> None:
+    """Background task: upsert an updated student profile in its own session."""
+    async with async_session_maker() as session:
+        try:
+            await UserRepository(session).get_or_create(**_user_fields(user_info))
+            await session.commit()
+            _remember_user(user_info)
+        except Exception as e:
+            await session.rollback()
+            logger.error("Error persisting user profile %s: %s", user_info.user_id, e)
+
+
+async def _load_recent_history(conversation_id: uuid.UUID) -> List[Dict[str, str]]:
+    """
+    Load the most recent messages of a conversation.
+    Uses its own session so it can run alongside the request session's writes.
+    """
+    async with async_session_maker() as session:
+        recent_messages = await MessageRepository(session).get_recent_messages(
+            conversation_id=conversation_id,
+            count=10
+        )
+    return [
+        {"role": msg.role, "content": msg.content}
+        for msg in recent_messages
+    ]
+
+
+def _dump(model: Any) -> Any:
+    """Dump an optional Pydantic model to plain Python data."""
+    return model.model_dump() if model is not None else None
+
+
+# Response is built from trusted workflow state, so it skips ChatResponse
+# validation; the model is kept for the OpenAPI schema only.
+@router.post(
+    "/chat",
+    response_class=ORJSONResponse,
+    responses={200: {"model": ChatResponse}}
+)
 async def chat_endpoint(
     request: ChatRequest, 
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
-) -> ChatResponse:
+) -> ORJSONResponse:
     """
     Main chat endpoint - orchestrates tool selection and execution.
     
@@ -33,102 +103,101 @@ async def chat_endpoint(
     4. Response formatting
     5. Database persistence (NEW!)
     """
-    logger.info(f"Chat request from user: {request.user_info.name}")
-    logger.info(f"Message: {request.message}")
+    logger.info("Chat request from user: %s", request.user_info.name)
+    logger.info("Message: %s", request.message)
+    
+    history_task: Optional[asyncio.Task] = None
     
     try:
-        # Generate conversation ID if not provided
-        conversation_id = request.conversation_id or str(uuid.uuid4())
+        # Generate conversation ID if not provided (as a stdlib UUID:
+        # orjson can't serialize uuid6's UUID subclass)
+        conversation_id = request.conversation_id or uuid.UUID(int=uuid7().int)
+        user_id = uuid.UUID(request.user_info.user_id)
         
-        # Get or create user in database
-        user_repo = UserRepository(db)
-        user, created = await user_repo.get_or_create(
-            user_id=request.user_info.user_id,
-            name=request.user_info.name,
-            grade_level=request.user_info.grade_level,
-            learning_style_summary=request.user_info.learning_style_summary,
-            emotional_state_summary=request.user_info.emotional_state_summary,
-            mastery_level_summary=request.user_info.mastery_level_summary,
-            teaching_style=request.user_info.teaching_style.value if hasattr(request.user_info.teaching_style, 'value') else request.user_info.teaching_style
-        )
-        if created:
-            logger.info(f"Created new user: {user.name}")
+        # Start loading stored history (if needed) while the user and
+        # conversation rows are written and the workflow starts; the intent
+        # node awaits it. New conversations have no history.
+        chat_history = request.chat_history
+        if not chat_history and request.conversation_id:
+            history_task = asyncio.create_task(_load_recent_history(conversation_id))
         
-        # Get or create conversation
-        conv_repo = ConversationRepository(db)
-        conversation, created = await conv_repo.get_or_create(
+        # Get or create user in database. Unknown users are written inline
+        # (conversations reference them); known users are refreshed in the
+        # background only when their profile changed.
+        known_user = _known_users.get(request.user_info.user_id)
+        if known_user is None:
+            user_repo = UserRepository(db)
+            user, created = await user_repo.get_or_create(**_user_fields(request.user_info))
+            if created:
+                logger.info("Created new user: %s", user.name)
+        elif known_user != request.user_info:
+            background_tasks.add_task(_persist_user_profile, request.user_info)
+        
+        # Make sure the conversation exists (one INSERT ... ON CONFLICT DO
+        # NOTHING, no read-back: the workflow only needs it as FK target)
+        created = await ConversationRepository(db).ensure_exists(
             conversation_id=conversation_id,
-            user_id=request.user_info.user_id
+            user_id=user_id
         )
         if created:
-            logger.info(f"Created new conversation: {conversation_id}")
-        
-        # Load recent chat history from database if not provided
-        chat_history = request.chat_history
-        if not chat_history:
-            msg_repo = MessageRepository(db)
-            recent_messages = await msg_repo.get_recent_messages(
-                conversation_id=conversation_id,
-                count=10
-            )
-            chat_history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in recent_messages
-            ]
-            logger.info(f"Loaded {len(chat_history)} messages from database")
-        
-        # Commit user and conversation before workflow
-        await db.commit()
+            logger.info("Created new conversation: %s", conversation_id)
         
         # Run orchestration workflow WITH database session
+        # (user, conversation and workflow writes share one transaction)
         result = await orchestrate(
             user_message=request.message,
             user_info=request.user_info,
             chat_history=chat_history,
             conversation_id=conversation_id,
-            db_session=db  # Pass database session!
+            db_session=db,  # Pass database session!
+            history_task=history_task
         )
         
         # Commit all workflow database operations
         await db.commit()
         logger.info("All database operations committed")
+        if known_user is None:
+            _remember_user(request.user_info)
         
         # Build response
-        response = ChatResponse(
-            conversation_id=conversation_id,
-            message=result.get("final_message", "Processing complete."),
-            tool_response=result.get("tool_response"),
-            extracted_parameters=result.get("extracted_params"),
-            needs_clarification=result.get("needs_clarification", False),
-            clarification_question=result.get("clarification_question")
-        )
+        response = ORJSONResponse({
+            "conversation_id": conversation_id,
+            "message": result.get("final_message") or "Processing complete.",
+            "tool_response": _dump(result.get("tool_response")),
+            "extracted_parameters": _dump(result.get("extracted_params")),
+            "needs_clarification": result.get("needs_clarification", False),
+            "clarification_question": result.get("clarification_question")
+        })
         
-        logger.info(f"Chat response prepared for conversation: {conversation_id}")
+        logger.info("Chat response prepared for conversation: %s", conversation_id)
         return response
         
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}", exc_info=True)
+        logger.error("Error in chat endpoint: %s", e, exc_info=True)
+        if history_task is not None and not history_task.done():
+            history_task.cancel()
         await db.rollback()
+        # The user row may be gone (deleted, DB reset) or never committed;
+        # upsert it again on the next request instead of trusting the cache
+        _known_users.pop(request.user_info.user_id, None)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error: {str(e)}"
         )
 
 
-@router.get("/health")
-async def health_check() -> Dict[str, Any]:
-    """Health check endpoint."""
-    return {
+# Static payloads - serialized once at import, returned as-is per request
+_HEALTH_RESPONSE = Response(
+    content=orjson.dumps({
         "status": "healthy",
         "service": "ai-tutor-orchestrator",
         "version": "1.0.0"
-    }
+    }),
+    media_type="application/json"
+)
 
-
-@router.get("/tools")
-async def list_tools() -> Dict[str, Any]:
-    """List available educational tools."""
-    return {
+_TOOLS_RESPONSE = Response(
+    content=orjson.dumps({
         "tools": [
             {
                 "name": "note_maker",
@@ -146,11 +215,25 @@ async def list_tools() -> Dict[str, Any]:
                 "required_params": ["concept_to_explain", "current_topic", "desired_depth"]
             }
         ]
-    }
+    }),
+    media_type="application/json"
+)
+
+
+@router.get("/health")
+async def health_check() -> Response:
+    """Health check endpoint."""
+    return _HEALTH_RESPONSE
+
+
+@router.get("/tools")
+async def list_tools() -> Response:
+    """List available educational tools."""
+    return _TOOLS_RESPONSE
 
 
 @router.get("/debug/state/{conversation_id}")
-async def get_conversation_state(conversation_id: str) -> Dict[str, Any]:
+async def get_conversation_state(conversation_id: uuid.UUID) -> Dict[str, Any]:
     """
     Debug endpoint to view conversation state.
     (In production, this would query the database)
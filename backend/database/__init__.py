@@ -1,5 +1,5 @@
 """Database package for PostgreSQL operations."""
-from .database import get_db, engine, async_session_maker, init_db, close_db, check_db_connection
+from .database import get_db, engine, async_session_maker, init_db, apply_indexes, close_db, check_db_connection
 from .models import User, Conversation, ChatMessage, ToolExecution, ParameterExtraction
 
 __all__ = [
@@ -7,6 +7,7 @@ __all__ = [
     "engine",
     "async_session_maker",
     "init_db",
+    "apply_indexes",
     "close_db",
     "check_db_connection",
     "User",
@@ -4,13 +4,14 @@ Handles PostgreSQL connection pooling and session management.
 """
 import os
 import logging
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Any
+import orjson
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
     async_sessionmaker,
 )
-from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -22,22 +23,87 @@ database_url = os.getenv("DATABASE_URL")
 if not database_url:
     raise ValueError("DATABASE_URL environment variable is required!")
 
+# Always run on the native asyncio driver (asyncpg), even if the URL was
+# copied with a sync driver scheme such as postgresql:// or postgresql+psycopg2://
+for _sync_scheme in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+    if database_url.startswith(_sync_scheme):
+        database_url = "postgresql+asyncpg://" + database_url[len(_sync_scheme):]
+        break
+
+# Transaction-pooling pgbouncer can't keep prepared statements per connection
+use_pgbouncer = os.getenv("USE_PGBOUNCER", "false").lower() == "true"
+
+
+def serialize_json(value: Any) -> bytes:
+    """
+    Serialize a JSON/JSONB bind value with orjson.
+    
+    bytes values are taken to be JSON serialized already (e.g. by
+    pydantic-core) and are passed through untouched.
+    """
+    if isinstance(value, bytes):
+        return value
+    return orjson.dumps(value)
+
+
+# Pool tuned for many short per-request transactions: LIFO reuse keeps a
+# small set of connections (and their prepared statement caches) hot, and
+# recycling after 30 min replaces pre-ping's extra round trip on every
+# checkout. Behind a transaction-pooling pgbouncer (USE_PGBOUNCER) the
+# bouncer does the multiplexing and this pool only caps client sockets.
 engine = create_async_engine(
     database_url,
     echo=False,  
-    pool_pre_ping=True,  
-    pool_size=10, 
-    max_overflow=20, 
-    pool_recycle=3600,  
+    pool_pre_ping=False,  
+    pool_size=20, 
+    max_overflow=40, 
+    pool_recycle=1800,  
+    pool_use_lifo=True,
+    json_serializer=serialize_json,  # JSON/JSONB binds go out as UTF-8 bytes
+    json_deserializer=orjson.loads,
     connect_args={
         "server_settings": {
             "application_name": "ai_tutor_orchestrator",
+            "jit": "off",  # JIT compile time dwarfs our tiny indexed queries
         },
         "command_timeout": 60,
-        "statement_cache_size": 0,  # Disable prepared statements for pgbouncer
+        "statement_cache_size": 0 if use_pgbouncer else 1024,  # Prepared statements off behind pgbouncer
+        "prepared_statement_cache_size": 0 if use_pgbouncer else 1024,  # SQLAlchemy-side asyncpg cache
     }
 )
 
+
+def _jsonb_encoder(value: bytes) -> bytes:
+    """Binary jsonb wire format: version byte + JSON text."""
+    return b"\x01" + value
+
+
+def _jsonb_decoder(value: bytes) -> Any:
+    return orjson.loads(value[1:])
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_json_codecs(dbapi_connection, connection_record):
+    """
+    Replace the dialect's str-based json/jsonb codecs with bytes-native ones.
+    
+    orjson output is handed to asyncpg as-is and results are parsed straight
+    from the wire bytes, skipping the str decode/encode round trip. Runs
+    after the dialect's own on-connect setup, so these codecs win.
+    """
+    async def register(connection):
+        await connection.set_type_codec(
+            "jsonb", encoder=_jsonb_encoder, decoder=_jsonb_decoder,
+            schema="pg_catalog", format="binary"
+        )
+        await connection.set_type_codec(
+            "json", encoder=bytes, decoder=orjson.loads,
+            schema="pg_catalog", format="binary"
+        )
+    
+    dbapi_connection.run_async(register)
+
+
 # Create session factory
 async_session_maker = async_sessionmaker(
     engine,
@@ -51,11 +117,11 @@ async_session_maker = async_sessionmaker(
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for FastAPI to get database session.
+    The endpoint owns the transaction boundary and commits explicitly.
     """
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -67,7 +133,7 @@ async def init_db():
     """
     Initialize database - create all tables.
     """
-    from .models import Base
+    from .models import Base, SCHEMA_DDL
     
     logger.info("Initializing database...")
     
@@ -76,6 +142,11 @@ async def init_db():
             # Create all tables
             await conn.run_sync(Base.metadata.create_all)
         
+        # Triggers/views not managed by create_all
+        async with engine.begin() as conn:
+            for ddl in SCHEMA_DDL:
+                await conn.exec_driver_sql(ddl)
+        
         logger.info("✅ Database initialized successfully")
         logger.info(f"Tables created: users, conversations, chat_messages, tool_executions, parameter_extractions")
         
@@ -84,6 +155,37 @@ async def init_db():
         raise
 
 
+async def apply_indexes():
+    """
+    Build the indexes in INDEX_DDL and drop the ones they replace.
+    
+    One-off migration step (run by scripts/init_db.py, not on app
+    startup). Indexes left INVALID by an interrupted concurrent build are
+    dropped and rebuilt; IF NOT EXISTS alone would skip them.
+    """
+    from .models import INDEX_DDL, DROPPED_INDEXES
+    
+    async with engine.connect() as conn:
+        # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for name, ddl in INDEX_DDL:
+            valid = (await conn.execute(_INDEX_IS_VALID, {"name": name})).scalar_one_or_none()
+            if valid is False:
+                logger.warning("Rebuilding invalid index %s", name)
+                await conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            await conn.exec_driver_sql(ddl)
+        for name in DROPPED_INDEXES:
+            await conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    
+    logger.info("✅ Indexes up to date")
+
+
+# NULL when the index doesn't exist
+_INDEX_IS_VALID = text(
+    "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+)
+
+
 async def close_db():
     """
     Close database connections.
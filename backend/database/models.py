@@ -4,13 +4,14 @@ Defines all tables: users, conversations, chat_messages, tool_executions, parame
 """
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, Text, 
-    ForeignKey, CheckConstraint, Index, JSON
+    ForeignKey, CheckConstraint, Index, JSON, desc
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB, TIMESTAMP
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
+from uuid6 import uuid7
 
 Base = declarative_base()
 
@@ -69,7 +70,7 @@ class Conversation(Base):
     """
     __tablename__ = "conversations"
     
-    conversation_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    conversation_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     started_at = Column(
         TIMESTAMP(timezone=True), 
@@ -86,8 +87,23 @@ class Conversation(Base):
     # Relationships
     user = relationship("User", back_populates="conversations")
     messages = relationship("ChatMessage", back_populates="conversation", cascade="all, delete-orphan")
-    tool_executions = relationship("ToolExecution", back_populates="conversation", cascade="all, delete-orphan")
-    parameter_extractions = relationship("ParameterExtraction", back_populates="conversation", cascade="all, delete-orphan")
+    # Analytics-only collections: never lazy-load them implicitly (an async
+    # lazy load is a hidden round trip); child rows are removed by the FK's
+    # ON DELETE CASCADE, so deletes don't need to load them either.
+    tool_executions = relationship(
+        "ToolExecution",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
+    )
+    parameter_extractions = relationship(
+        "ParameterExtraction",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True
+    )
     
     # Constraints
     __table_args__ = (
@@ -103,10 +119,14 @@ class ChatMessage(Base):
     """
     Chat messages table.
     Stores individual messages in conversations.
+    
+    content uses lz4 TOAST compression (see SCHEMA_DDL). History reads fetch
+    content every time, so it stays compressed (not EXTERNAL); lz4 simply
+    decompresses much faster than the default pglz.
     """
     __tablename__ = "chat_messages"
     
-    message_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    message_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     conversation_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("conversations.conversation_id", ondelete="CASCADE"), 
@@ -130,8 +150,15 @@ class ChatMessage(Base):
             "role IN ('user', 'assistant')",
             name="role_check"
         ),
-        Index("idx_messages_conversation", "conversation_id"),
-        Index("idx_messages_timestamp", "timestamp"),
+        # Serves "latest N messages of a conversation" (and keyset pages of
+        # older ones) as one index range scan. message_id (time-ordered
+        # UUIDv7) breaks ties between rows written in the same transaction.
+        Index(
+            "idx_messages_conv_ts_id",
+            "conversation_id",
+            desc("timestamp"),
+            desc("message_id")
+        ),
     )
     
     def __repr__(self):
@@ -145,7 +172,7 @@ class ToolExecution(Base):
     """
     __tablename__ = "tool_executions"
     
-    execution_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    execution_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     conversation_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("conversations.conversation_id", ondelete="CASCADE"), 
@@ -172,10 +199,15 @@ class ToolExecution(Base):
             "tool_type IN ('note_maker', 'flashcard_generator', 'concept_explainer')",
             name="tool_type_check"
         ),
-        Index("idx_executions_conversation", "conversation_id"),
+        Index("idx_executions_conv_created", "conversation_id", desc("created_at")),
         Index("idx_executions_tool_type", "tool_type"),
         Index("idx_executions_created_at", "created_at"),
-        Index("idx_executions_params", "input_params", postgresql_using="gin"),
+        Index(
+            "idx_executions_params_path",
+            "input_params",
+            postgresql_using="gin",
+            postgresql_ops={"input_params": "jsonb_path_ops"}
+        ),
     )
     
     def __repr__(self):
@@ -188,7 +220,7 @@ class ParameterExtraction(Base):
     """
     __tablename__ = "parameter_extractions"
     
-    extraction_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    extraction_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     conversation_id = Column(
         UUID(as_uuid=True), 
         ForeignKey("conversations.conversation_id", ondelete="CASCADE"), 
@@ -210,10 +242,122 @@ class ParameterExtraction(Base):
     
     # Constraints
     __table_args__ = (
-        Index("idx_extractions_conversation", "conversation_id"),
+        Index("idx_extractions_conv_created", "conversation_id", desc("created_at")),
         Index("idx_extractions_confidence", "confidence_score"),
         Index("idx_extractions_created_at", "created_at"),
+        Index(
+            "idx_extractions_params_path",
+            "extracted_params",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_params": "jsonb_path_ops"}
+        ),
+        Index(
+            "idx_extractions_inferred_path",
+            "inferred_params",
+            postgresql_using="gin",
+            postgresql_ops={"inferred_params": "jsonb_path_ops"}
+        ),
     )
     
     def __repr__(self):
         return f"<ParameterExtraction(id={self.extraction_id}, confidence={self.confidence_score})>"
+
+
+# ============================================================================
+# DATABASE-SIDE OBJECTS
+# ============================================================================
+
+# Idempotent DDL applied by init_db() after create_all(). Holds objects
+# create_all() doesn't manage or won't add to existing tables. Index
+# changes on live tables are in INDEX_DDL instead.
+SCHEMA_DDL = [
+    # Keep conversations.message_count / last_message_at in step with
+    # chat_messages inserts (one UPDATE per INSERT statement, not per row)
+    """
+    CREATE OR REPLACE FUNCTION bump_conversation_message_count() RETURNS trigger AS $$
+    BEGIN
+        UPDATE conversations AS c
+        SET message_count = c.message_count + n.added,
+            last_message_at = now()
+        FROM (
+            SELECT conversation_id, count(*) AS added
+            FROM new_messages
+            GROUP BY conversation_id
+        ) AS n
+        WHERE c.conversation_id = n.conversation_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER chat_messages_bump_conversation
+    AFTER INSERT ON chat_messages
+    REFERENCING NEW TABLE AS new_messages
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_conversation_message_count()
+    """,
+    # Long LLM replies get TOASTed; lz4 (PG14+) decompresses far faster than
+    # pglz. Applies to newly written values only.
+    "ALTER TABLE chat_messages ALTER COLUMN content SET COMPRESSION lz4",
+    # Pre-aggregated extraction stats so reads never scan the table; the
+    # unique index allows REFRESH MATERIALIZED VIEW CONCURRENTLY
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS parameter_extraction_stats AS
+    SELECT
+        1 AS id,
+        count(*) AS total,
+        count(*) FILTER (WHERE inferred_params IS NOT NULL) AS with_inferred,
+        avg(confidence_score) AS avg_confidence,
+        count(*) FILTER (WHERE confidence_score >= 0.8) AS high_confidence
+    FROM parameter_extractions
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_parameter_extraction_stats_id
+    ON parameter_extraction_stats (id)
+    """,
+]
+
+
+# Index changes on existing tables, built CONCURRENTLY so writes aren't
+# blocked. Applied by scripts/init_db.py (apply_indexes()), never on app
+# startup: concurrent builds from several workers race, and an interrupted
+# build leaves an INVALID index that IF NOT EXISTS would skip forever.
+INDEX_DDL = [
+    # JSONB containment (@>) indexes use jsonb_path_ops: smaller and faster
+    # than the default jsonb_ops for @> lookups
+    ("idx_executions_params_path", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_executions_params_path
+    ON tool_executions USING gin (input_params jsonb_path_ops)
+    """),
+    ("idx_extractions_params_path", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extractions_params_path
+    ON parameter_extractions USING gin (extracted_params jsonb_path_ops)
+    """),
+    ("idx_extractions_inferred_path", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extractions_inferred_path
+    ON parameter_extractions USING gin (inferred_params jsonb_path_ops)
+    """),
+    # Composite (conversation_id, time DESC) indexes replace the
+    # single-column ones for per-conversation "latest N" reads
+    ("idx_messages_conv_ts_id", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_conv_ts_id
+    ON chat_messages (conversation_id, "timestamp" DESC, message_id DESC)
+    """),
+    ("idx_executions_conv_created", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_executions_conv_created
+    ON tool_executions (conversation_id, created_at DESC)
+    """),
+    ("idx_extractions_conv_created", """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_extractions_conv_created
+    ON parameter_extractions (conversation_id, created_at DESC)
+    """),
+]
+
+# Indexes superseded by INDEX_DDL, dropped once the replacements exist
+DROPPED_INDEXES = [
+    "idx_executions_params",
+    "idx_messages_conv_ts",
+    "idx_messages_conversation",
+    "idx_messages_timestamp",
+    "idx_executions_conversation",
+    "idx_extractions_conversation",
+]
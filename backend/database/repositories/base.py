@@ -1,13 +1,17 @@
 """
 Base repository with common functionality.
-Eliminates duplicate UUID conversion logic across all repositories.
+IDs are parsed to UUID once at the API boundary; repositories take UUIDs.
 """
-from typing import TypeVar, Generic
-from uuid import UUID
+from typing import TypeVar, Generic, List, Dict, Any, Type
+from sqlalchemy import Table, JSON, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import serialize_json
 
 T = TypeVar('T')
 
+# Batches at least this large are written with PostgreSQL COPY
+COPY_THRESHOLD = 100
+
 
 class BaseRepository(Generic[T]):
     """Base repository class with shared utilities."""
@@ -15,19 +19,72 @@ class BaseRepository(Generic[T]):
     def __init__(self, session: AsyncSession):
         self.session = session
     
-    @staticmethod
-    def to_uuid(value: str | UUID) -> UUID:
+    def _add(self, obj: T) -> T:
         """
-        Convert string to UUID if needed.
-        Handles both string and UUID inputs gracefully.
+        Add object to the session without flushing.
+        
+        The INSERT is sent with the next flush (at the latest on commit),
+        batched with any other pending objects. Flush explicitly before
+        issuing Core statements that depend on the row, since the session
+        does not autoflush.
         """
-        return UUID(value) if isinstance(value, str) else value
+        self.session.add(obj)
+        return obj
     
-    async def _add_and_flush(self, obj: T) -> T:
+    async def _insert_returning(self, model: Type[T], **values: Any) -> T:
         """
-        Add object to session and flush.
-        Common pattern used across all repositories.
+        Insert one row with a Core INSERT ... RETURNING.
+        
+        Skips the unit-of-work flush for insert-only log rows. The primary
+        key and server-side defaults come back from the same statement and
+        are set on a transient instance (not attached to the session).
         """
-        self.session.add(obj)
-        await self.session.flush()
-        return obj
+        table = model.__table__
+        returning = [
+            column for column in table.columns
+            if column.primary_key or column.server_default is not None
+        ]
+        result = await self.session.execute(
+            insert(table).values(**values).returning(*returning)
+        )
+        return model(**{**values, **result.one()._asdict()})
+    
+    async def _bulk_insert(self, table: Table, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert many rows in a single round trip.
+        
+        Small batches go out as one multi-row INSERT; batches of
+        COPY_THRESHOLD rows or more are streamed via asyncpg's COPY.
+        All rows must have the same keys, including any Python-side
+        defaults (COPY only applies server-side defaults). JSON/JSONB
+        values are passed as Python objects or pre-serialized bytes
+        either way.
+        """
+        if not rows:
+            return
+        
+        if len(rows) < COPY_THRESHOLD:
+            await self.session.execute(insert(table).values(rows))
+            return
+        
+        columns = list(rows[0].keys())
+        # COPY bypasses SQLAlchemy's bind processing, so encode JSON here
+        json_columns = {
+            column.name for column in table.columns
+            if isinstance(column.type, JSON)
+        }
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name,
+            records=[
+                tuple(
+                    serialize_json(row[column])
+                    if column in json_columns and row[column] is not None
+                    else row[column]
+                    for column in columns
+                )
+                for row in rows
+            ],
+            columns=columns
+        )
@@ -3,7 +3,10 @@ Conversation Repository - Data access layer for conversations table.
 """
 import logging
 from typing import Optional
-from sqlalchemy import select, update, func
+from uuid import UUID
+from sqlalchemy import update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import Conversation
 from database.repositories.base import BaseRepository
@@ -16,54 +19,98 @@ class ConversationRepository(BaseRepository[Conversation]):
     
     async def create(
         self,
-        conversation_id: str,
-        user_id: str
+        conversation_id: UUID,
+        user_id: UUID
     ) -> Conversation:
         """Create a new conversation."""
         conversation = Conversation(
-            conversation_id=self.to_uuid(conversation_id),
-            user_id=self.to_uuid(user_id)
+            conversation_id=conversation_id,
+            user_id=user_id
         )
         
-        await self._add_and_flush(conversation)
-        logger.info(f"Created conversation: {conversation.conversation_id}")
+        self._add(conversation)
+        logger.debug("Created conversation: %s", conversation.conversation_id)
         return conversation
     
-    async def get_by_id(self, conversation_id: str) -> Optional[Conversation]:
-        """Get conversation by ID."""
-        result = await self.session.execute(
-            select(Conversation).where(Conversation.conversation_id == self.to_uuid(conversation_id))
+    async def get_by_id(self, conversation_id: UUID) -> Optional[Conversation]:
+        """
+        Get conversation by ID.
+        
+        Served from the session's identity map when the row was already
+        loaded (or inserted) in this session, so repeated lookups within a
+        request cost no round trip. Bulk UPDATEs in this repository keep
+        the mapped instance in sync.
+        """
+        return await self.session.get(
+            Conversation,
+            conversation_id,
+            options=[raiseload("*")]
         )
-        return result.scalar_one_or_none()
     
     async def get_or_create(
         self,
-        conversation_id: str,
-        user_id: str
+        conversation_id: UUID,
+        user_id: UUID
     ) -> tuple[Conversation, bool]:
         """
         Get existing conversation or create new one.
         Returns (conversation, created) tuple.
-        """
-        conversation = await self.get_by_id(conversation_id)
         
-        if conversation:
-            return conversation, False
-        else:
-            conversation = await self.create(
+        Tries INSERT ... ON CONFLICT DO NOTHING RETURNING first (one round
+        trip for new conversations, atomic across workers) and only reads
+        the row back when it already existed.
+        """
+        stmt = (
+            pg_insert(Conversation)
+            .values(
                 conversation_id=conversation_id,
                 user_id=user_id
             )
+            .on_conflict_do_nothing(index_elements=[Conversation.conversation_id])
+            .returning(Conversation)
+        )
+        result = await self.session.execute(stmt)
+        conversation = result.scalar_one_or_none()
+        
+        if conversation is not None:
             return conversation, True
+        return await self.get_by_id(conversation_id), False
     
-    async def increment_message_count(self, conversation_id: str):
-        """Increment message count and update last_message_at timestamp."""
+    async def ensure_exists(
+        self,
+        conversation_id: UUID,
+        user_id: UUID
+    ) -> bool:
+        """
+        Make sure a conversation row exists without reading it back.
+        
+        A single INSERT ... ON CONFLICT DO NOTHING; use this instead of
+        get_or_create when the caller only needs the row to exist (e.g. as
+        the FK target for messages).
+        
+        Returns:
+            True if the conversation was created by this call
+        """
+        result = await self.session.execute(
+            pg_insert(Conversation.__table__)
+            .values(conversation_id=conversation_id, user_id=user_id)
+            .on_conflict_do_nothing(index_elements=["conversation_id"])
+            .returning(Conversation.__table__.c.conversation_id)
+        )
+        return result.scalar_one_or_none() is not None
+    
+    async def increment_message_count(self, conversation_id: UUID, by: int = 1):
+        """
+        Add `by` to the message count and update last_message_at timestamp.
+        Message inserts are already counted by the chat_messages trigger;
+        use this only for manual adjustments.
+        """
         await self.session.execute(
             update(Conversation)
-            .where(Conversation.conversation_id == self.to_uuid(conversation_id))
+            .where(Conversation.conversation_id == conversation_id)
             .values(
-                message_count=Conversation.message_count + 1,
+                message_count=Conversation.message_count + by,
                 last_message_at=func.now()
             )
+            .execution_options(synchronize_session="fetch")
         )
-        await self.session.flush()
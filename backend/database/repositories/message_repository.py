@@ -2,87 +2,173 @@
 Message Repository - Data access layer for chat_messages table.
 """
 import logging
-from typing import List
-from sqlalchemy import select
+from typing import List, Dict, Any, AsyncIterator, Optional
+from uuid import UUID
+from uuid6 import uuid7
+from sqlalchemy import select, bindparam, tuple_
+from sqlalchemy.orm import aliased
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import ChatMessage
 from database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Statements are built once at import time and parameterised with bind
+# parameters, so SQLAlchemy's compiled cache (and asyncpg's prepared
+# statement cache) is reused across calls.
+#
+# Messages are ordered by (timestamp, message_id), matching
+# idx_messages_conv_ts_id; message_id breaks ties between messages written
+# in the same transaction (which share now()).
+_ASC = (ChatMessage.timestamp.asc(), ChatMessage.message_id.asc())
+_DESC = (ChatMessage.timestamp.desc(), ChatMessage.message_id.desc())
+_POSITION = tuple_(ChatMessage.timestamp, ChatMessage.message_id)
+_CURSOR = tuple_(
+    bindparam("cursor_timestamp", type_=ChatMessage.timestamp.type),
+    bindparam("cursor_id", type_=ChatMessage.message_id.type)
+)
+
+_ALL_MESSAGES = (
+    select(ChatMessage)
+    .where(ChatMessage.conversation_id == bindparam("conversation_id"))
+    .order_by(*_ASC)
+)
+_messages_by_conversation = (
+    select(ChatMessage)
+    .where(ChatMessage.conversation_id == bindparam("conversation_id"))
+    .limit(bindparam("limit"))
+)
+_MESSAGES_ASC = _messages_by_conversation.order_by(*_ASC)
+_MESSAGES_DESC = _messages_by_conversation.order_by(*_DESC)
+# Keyset pages: rows strictly after / before the cursor message
+_MESSAGES_ASC_AFTER = _MESSAGES_ASC.where(_POSITION > _CURSOR)
+_MESSAGES_DESC_BEFORE = _MESSAGES_DESC.where(_POSITION < _CURSOR)
+
+# N most recent messages via a subquery, re-ordered chronologically.
+# Selecting the aliased entity (not the raw subquery) yields ChatMessage objects.
+_recent = aliased(ChatMessage, _MESSAGES_DESC.subquery("recent"))
+_RECENT_MESSAGES = select(_recent).order_by(_recent.timestamp.asc(), _recent.message_id.asc())
+
 
 class MessageRepository(BaseRepository[ChatMessage]):
     """Repository for ChatMessage operations."""
     
     async def create(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         role: str,
         content: str,
         tool_used: str = None
     ) -> ChatMessage:
         """Create a new chat message."""
-        message = ChatMessage(
-            conversation_id=self.to_uuid(conversation_id),
+        message = await self._insert_returning(
+            ChatMessage,
+            conversation_id=conversation_id,
             role=role,
             content=content,
             tool_used=tool_used
         )
-        
-        await self._add_and_flush(message)
-        logger.info(f"Created message: {message.message_id} (role={role}, conv={conversation_id})")
+        logger.debug("Created message: %s (role=%s, conv=%s)", message.message_id, role, conversation_id)
         return message
     
+    async def create_many(
+        self,
+        conversation_id: UUID,
+        messages: List[Dict[str, Any]]
+    ) -> None:
+        """
+        Create several chat messages in one round trip.
+        
+        Args:
+            conversation_id: Conversation ID
+            messages: Dicts with "role", "content" and optional "tool_used"
+        """
+        await self._bulk_insert(
+            ChatMessage.__table__,
+            [
+                {
+                    "message_id": uuid7(),
+                    "conversation_id": conversation_id,
+                    "role": message["role"],
+                    "content": message["content"],
+                    "tool_used": message.get("tool_used")
+                }
+                for message in messages
+            ]
+        )
+        logger.debug("Created %d messages (conv=%s)", len(messages), conversation_id)
+    
     async def get_messages(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         limit: int = 50,
-        order: str = "asc"
+        order: str = "asc",
+        cursor: Optional[ChatMessage] = None
     ) -> List[ChatMessage]:
         """
         Get messages for a conversation with flexible ordering.
         
+        Pages with keyset pagination: pass the last message of the previous
+        page as `cursor` to continue after it, which is an index range scan
+        instead of an OFFSET.
+        
         Args:
             conversation_id: Conversation ID
             limit: Maximum number of messages to return
             order: "asc" for chronological (oldest first), "desc" for newest first
+            cursor: Last message of the previous page (first page if None)
             
         Returns:
             List of messages in requested order
         """
-        query = (
-            select(ChatMessage)
-            .where(ChatMessage.conversation_id == self.to_uuid(conversation_id))
-            .limit(limit)
-        )
-        
-        if order == "desc":
-            query = query.order_by(ChatMessage.timestamp.desc())
+        params = {"conversation_id": conversation_id, "limit": limit}
+        if cursor is None:
+            query = _MESSAGES_DESC if order == "desc" else _MESSAGES_ASC
         else:
-            query = query.order_by(ChatMessage.timestamp.asc())
+            query = _MESSAGES_DESC_BEFORE if order == "desc" else _MESSAGES_ASC_AFTER
+            params["cursor_timestamp"] = cursor.timestamp
+            params["cursor_id"] = cursor.message_id
         
-        result = await self.session.execute(query)
+        result = await self.session.execute(query, params)
         return list(result.scalars().all())
     
     async def get_recent_messages(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         count: int = 10
     ) -> List[ChatMessage]:
         """
         Get the N most recent messages in chronological order (oldest first).
         Returns up to 'count' messages, ordered by timestamp ascending.
         """
-        # Use a subquery to get the N most recent, then order them chronologically
-        query = (
-            select(ChatMessage)
-            .where(ChatMessage.conversation_id == self.to_uuid(conversation_id))
-            .order_by(ChatMessage.timestamp.desc())
-            .limit(count)
-        ).alias("recent")
+        result = await self.session.execute(
+            _RECENT_MESSAGES,
+            {"conversation_id": conversation_id, "limit": count}
+        )
+        return list(result.scalars().all())
+    
+    async def iter_messages(
+        self,
+        conversation_id: UUID,
+        batch_size: int = 200
+    ) -> AsyncIterator[ChatMessage]:
+        """
+        Stream all messages of a conversation in chronological order.
         
-        # Wrap in outer query to re-order chronologically
-        final_query = select(query).order_by(query.c.timestamp.asc())
+        Rows are fetched from a server-side cursor in batches of batch_size,
+        so long conversations never have to be held in memory at once. Use
+        get_messages for small, bounded reads.
         
-        result = await self.session.execute(final_query)
-        return list(result.scalars().all())
+        Args:
+            conversation_id: Conversation ID
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Messages, oldest first
+        """
+        result = await self.session.stream_scalars(
+            _ALL_MESSAGES.execution_options(yield_per=batch_size),
+            {"conversation_id": conversation_id}
+        )
+        async for message in result:
+            yield message
@@ -2,20 +2,31 @@
 Parameter Extraction Repository - Data access layer for parameter_extractions table.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
+from uuid import UUID
+from uuid6 import uuid7
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import ParameterExtraction
 from database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+_INFERENCE_STATS = text(
+    "SELECT total, with_inferred, avg_confidence, high_confidence "
+    "FROM parameter_extraction_stats"
+)
+_REFRESH_INFERENCE_STATS = text(
+    "REFRESH MATERIALIZED VIEW CONCURRENTLY parameter_extraction_stats"
+)
+
 
 class ParameterExtractionRepository(BaseRepository[ParameterExtraction]):
     """Repository for ParameterExtraction operations."""
     
     async def create(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         user_message: str,
         extracted_params: Dict[str, Any],
         inferred_params: Optional[Dict[str, Any]] = None,
@@ -23,15 +34,78 @@ class ParameterExtractionRepository(BaseRepository[ParameterExtraction]):
         missing_required: Optional[Dict[str, Any]] = None
     ) -> ParameterExtraction:
         """Create a new parameter extraction record."""
-        extraction = ParameterExtraction(
-            conversation_id=self.to_uuid(conversation_id),
+        extraction = await self._insert_returning(
+            ParameterExtraction,
+            conversation_id=conversation_id,
             user_message=user_message,
             extracted_params=extracted_params,
             inferred_params=inferred_params,
             confidence_score=confidence_score,
             missing_required=missing_required
         )
-        
-        await self._add_and_flush(extraction)
-        logger.info(f"Logged parameter extraction: confidence={confidence_score:.2f}, inferred={len(inferred_params or {})}")
+        logger.debug("Logged parameter extraction: confidence=%.2f", confidence_score)
         return extraction
+    
+    async def create_many(
+        self,
+        conversation_id: UUID,
+        records: List[Dict[str, Any]]
+    ) -> List[UUID]:
+        """
+        Create several parameter extraction records in one round trip.
+        
+        Args:
+            conversation_id: Conversation ID
+            records: Dicts with the keyword arguments of create()
+                (minus conversation_id)
+            
+        Returns:
+            IDs of the new records, in input order
+        """
+        rows = [
+            {
+                "extraction_id": uuid7(),
+                "conversation_id": conversation_id,
+                "user_message": record["user_message"],
+                "extracted_params": record["extracted_params"],
+                "inferred_params": record.get("inferred_params"),
+                "confidence_score": record.get("confidence_score", 0.0),
+                "missing_required": record.get("missing_required")
+            }
+            for record in records
+        ]
+        await self._bulk_insert(ParameterExtraction.__table__, rows)
+        logger.debug("Logged %d parameter extractions (conv=%s)", len(rows), conversation_id)
+        return [row["extraction_id"] for row in rows]
+    
+    async def get_inference_stats(self) -> Dict[str, Any]:
+        """
+        Get aggregate extraction statistics.
+        
+        Reads the parameter_extraction_stats materialized view (one row).
+        The view is not refreshed in the background: call
+        refresh_inference_stats() first when current figures are needed.
+        
+        Returns:
+            Dict with total, inferred_rate, average_confidence and
+            high_confidence_rate (rates as fractions 0.0-1.0)
+        """
+        row = (await self.session.execute(_INFERENCE_STATS)).one_or_none()
+        total = row.total if row else 0
+        if not total:
+            return {
+                "total": 0,
+                "inferred_rate": 0.0,
+                "average_confidence": 0.0,
+                "high_confidence_rate": 0.0
+            }
+        return {
+            "total": total,
+            "inferred_rate": row.with_inferred / total,
+            "average_confidence": float(row.avg_confidence),
+            "high_confidence_rate": row.high_confidence / total
+        }
+    
+    async def refresh_inference_stats(self) -> None:
+        """Recompute the parameter_extraction_stats materialized view."""
+        await self.session.execute(_REFRESH_INFERENCE_STATS)
@@ -2,20 +2,38 @@
 Tool Execution Repository - Data access layer for tool_executions table.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Union
+from uuid import UUID
+from uuid6 import uuid7
+from sqlalchemy import select, func, bindparam, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from database.models import ToolExecution
+from database.models import ToolExecution, ChatMessage
 from database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Per-tool aggregates, built once at import (see get_stats_by_tool)
+_total = func.count()
+_successful = func.count().filter(ToolExecution.success)
+_STATS_BY_TOOL = select(
+    ToolExecution.tool_type,
+    _total.label("total"),
+    _successful.label("successful"),
+    (_successful * 100.0 / func.nullif(_total, 0)).label("success_rate"),
+    func.avg(ToolExecution.execution_time_ms).label("avg_execution_time_ms"),
+    func.sum(ToolExecution.execution_time_ms).label("total_execution_time_ms")
+).group_by(ToolExecution.tool_type)
+_STATS_BY_TOOL_FOR_CONVERSATION = _STATS_BY_TOOL.where(
+    ToolExecution.conversation_id == bindparam("conversation_id")
+)
+
 
 class ToolExecutionRepository(BaseRepository[ToolExecution]):
     """Repository for ToolExecution operations."""
     
     async def create(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         tool_type: str,
         input_params: Dict[str, Any],
         output_data: Optional[Dict[str, Any]] = None,
@@ -24,8 +42,9 @@ class ToolExecutionRepository(BaseRepository[ToolExecution]):
         error_message: Optional[str] = None
     ) -> ToolExecution:
         """Create a new tool execution record."""
-        execution = ToolExecution(
-            conversation_id=self.to_uuid(conversation_id),
+        execution = await self._insert_returning(
+            ToolExecution,
+            conversation_id=conversation_id,
             tool_type=tool_type,
             input_params=input_params,
             output_data=output_data,
@@ -33,7 +52,106 @@ class ToolExecutionRepository(BaseRepository[ToolExecution]):
             success=success,
             error_message=error_message
         )
-        
-        await self._add_and_flush(execution)
-        logger.info(f"Logged tool execution: {tool_type} (success={success}, time={execution_time_ms}ms)")
+        logger.debug("Logged tool execution: %s (success=%s, time=%sms)", tool_type, success, execution_time_ms)
         return execution
+    
+    async def create_with_reply(
+        self,
+        conversation_id: UUID,
+        tool_type: str,
+        input_params: Union[Dict[str, Any], bytes],
+        reply: str,
+        output_data: Optional[Dict[str, Any]] = None,
+        execution_time_ms: Optional[int] = None,
+        success: bool = True,
+        error_message: Optional[str] = None
+    ) -> UUID:
+        """
+        Record a tool execution and the assistant reply in one round trip.
+        
+        The execution INSERT runs as a data-modifying CTE of the message
+        INSERT, so both rows go out as a single statement. input_params
+        may be pre-serialized JSON bytes.
+        
+        Returns:
+            ID of the new execution record
+        """
+        execution_id = uuid7()
+        execution_insert = insert(ToolExecution.__table__).values(
+            execution_id=execution_id,
+            conversation_id=conversation_id,
+            tool_type=tool_type,
+            input_params=input_params,
+            output_data=output_data,
+            execution_time_ms=execution_time_ms,
+            success=success,
+            error_message=error_message
+        ).cte("new_execution")
+        
+        await self.session.execute(
+            insert(ChatMessage.__table__).values(
+                message_id=uuid7(),
+                conversation_id=conversation_id,
+                role="assistant",
+                content=reply,
+                tool_used=tool_type
+            ).add_cte(execution_insert)
+        )
+        logger.debug("Logged tool execution with reply: %s (success=%s, time=%sms)", tool_type, success, execution_time_ms)
+        return execution_id
+    
+    async def create_many(
+        self,
+        conversation_id: UUID,
+        records: List[Dict[str, Any]]
+    ) -> List[UUID]:
+        """
+        Create several tool execution records in one round trip.
+        
+        Args:
+            conversation_id: Conversation ID
+            records: Dicts with the keyword arguments of create()
+                (minus conversation_id)
+            
+        Returns:
+            IDs of the new records, in input order
+        """
+        rows = [
+            {
+                "execution_id": uuid7(),
+                "conversation_id": conversation_id,
+                "tool_type": record["tool_type"],
+                "input_params": record["input_params"],
+                "output_data": record.get("output_data"),
+                "execution_time_ms": record.get("execution_time_ms"),
+                "success": record.get("success", True),
+                "error_message": record.get("error_message")
+            }
+            for record in records
+        ]
+        await self._bulk_insert(ToolExecution.__table__, rows)
+        logger.debug("Logged %d tool executions (conv=%s)", len(rows), conversation_id)
+        return [row["execution_id"] for row in rows]
+    
+    async def get_stats_by_tool(
+        self,
+        conversation_id: Optional[UUID] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-tool execution statistics in a single grouped query.
+        
+        Args:
+            conversation_id: Restrict to one conversation (all if None)
+            
+        Returns:
+            One dict per tool type with total, successful, success_rate (%),
+            avg_execution_time_ms and total_execution_time_ms
+        """
+        if conversation_id is None:
+            result = await self.session.execute(_STATS_BY_TOOL)
+        else:
+            result = await self.session.execute(
+                _STATS_BY_TOOL_FOR_CONVERSATION,
+                {"conversation_id": conversation_id}
+            )
+        return [dict(row._mapping) for row in result]
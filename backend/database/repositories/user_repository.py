@@ -3,20 +3,32 @@ User Repository - Data access layer for users table.
 """
 import logging
 from typing import Optional
-from sqlalchemy import select
+from uuid import UUID
+from sqlalchemy import select, func, literal_column, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import raiseload
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models import User
 from database.repositories.base import BaseRepository
 
 logger = logging.getLogger(__name__)
 
+# Built once so the compiled form is reused across calls; relationships
+# must be loaded explicitly rather than lazily per attribute access
+_USER_BY_ID = (
+    select(User)
+    .where(User.user_id == bindparam("user_id"))
+    .options(raiseload("*"))
+    .limit(1)
+)
+
 
 class UserRepository(BaseRepository[User]):
     """Repository for User operations."""
     
     async def create(
         self,
-        user_id: str,
+        user_id: UUID,
         name: str,
         grade_level: str,
         learning_style_summary: str = "",
@@ -26,7 +38,7 @@ class UserRepository(BaseRepository[User]):
     ) -> User:
         """Create a new user."""
         user = User(
-            user_id=self.to_uuid(user_id),
+            user_id=user_id,
             name=name,
             grade_level=grade_level,
             learning_style_summary=learning_style_summary,
@@ -35,47 +47,18 @@ class UserRepository(BaseRepository[User]):
             teaching_style=teaching_style
         )
         
-        await self._add_and_flush(user)
-        logger.info(f"Created user: {user.user_id}")
+        self._add(user)
+        logger.debug("Created user: %s", user.user_id)
         return user
     
-    async def get_by_id(self, user_id: str) -> Optional[User]:
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Get user by ID."""
-        result = await self.session.execute(
-            select(User).where(User.user_id == self.to_uuid(user_id))
-        )
-        return result.scalar_one_or_none()
-    
-    async def update(
-        self,
-        user_id: str,
-        name: str,
-        grade_level: str,
-        learning_style_summary: str = "",
-        emotional_state_summary: str = "",
-        mastery_level_summary: str = "",
-        teaching_style: str = "direct"
-    ) -> User:
-        """
-        Update existing user with new information.
-        Returns updated user.
-        """
-        user = await self.get_by_id(user_id)
-        if not user:
-            raise ValueError(f"User {user_id} not found")
-        
-        user.name = name
-        user.grade_level = grade_level
-        user.learning_style_summary = learning_style_summary
-        user.emotional_state_summary = emotional_state_summary
-        user.mastery_level_summary = mastery_level_summary
-        user.teaching_style = teaching_style
-        await self.session.flush()
-        return user
+        result = await self.session.execute(_USER_BY_ID, {"user_id": user_id})
+        return result.scalars().first()
     
     async def get_or_create(
         self,
-        user_id: str,
+        user_id: UUID,
         name: str,
         grade_level: str,
         learning_style_summary: str = "",
@@ -87,29 +70,35 @@ class UserRepository(BaseRepository[User]):
         Get existing user or create new one.
         If user exists, updates their information.
         Returns (user, created) tuple where created=True if new user was created.
+        
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE ... RETURNING;
+        `xmax = 0` on the returned row means it was freshly inserted.
         """
-        user = await self.get_by_id(user_id)
+        stmt = pg_insert(User).values(
+            user_id=user_id,
+            name=name,
+            grade_level=grade_level,
+            learning_style_summary=learning_style_summary,
+            emotional_state_summary=emotional_state_summary,
+            mastery_level_summary=mastery_level_summary,
+            teaching_style=teaching_style
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.user_id],
+            set_={
+                "name": stmt.excluded.name,
+                "grade_level": stmt.excluded.grade_level,
+                "learning_style_summary": stmt.excluded.learning_style_summary,
+                "emotional_state_summary": stmt.excluded.emotional_state_summary,
+                "mastery_level_summary": stmt.excluded.mastery_level_summary,
+                "teaching_style": stmt.excluded.teaching_style,
+                "updated_at": func.now()
+            }
+        ).returning(User, literal_column("(xmax = 0)").label("created"))
         
-        if user:
-            # Update existing user with latest request data
-            await self.update(
-                user_id=user_id,
-                name=name,
-                grade_level=grade_level,
-                learning_style_summary=learning_style_summary,
-                emotional_state_summary=emotional_state_summary,
-                mastery_level_summary=mastery_level_summary,
-                teaching_style=teaching_style
-            )
-            return user, False
-        else:
-            user = await self.create(
-                user_id=user_id,
-                name=name,
-                grade_level=grade_level,
-                learning_style_summary=learning_style_summary,
-                emotional_state_summary=emotional_state_summary,
-                mastery_level_summary=mastery_level_summary,
-                teaching_style=teaching_style
-            )
-            return user, True
+        result = await self.session.execute(
+            stmt,
+            execution_options={"populate_existing": True}
+        )
+        row = result.one()
+        return row.User, bool(row.created)
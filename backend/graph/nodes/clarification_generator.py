@@ -2,17 +2,15 @@
 Clarification Generator Node - Generates clarification questions for missing parameters.
 """
 import logging
-from typing import Dict, Any
 
 from services.gemini_service import gemini_service
 from utils.educational_logger import edu_logger
-from graph.utils.node_persistence import NodePersistence
-from graph.utils.state_manager import add_processing_step
+from graph.utils.state_manager import WorkflowState, add_processing_step
 
 logger = logging.getLogger(__name__)
 
 
-async def clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def clarification_node(state: WorkflowState) -> WorkflowState:
     """
     Node 4b: Generate clarification question if parameters are missing.
     
@@ -20,31 +18,35 @@ async def clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         state: Current workflow state
         
     Returns:
-        Updated state with clarification question
+        State update with clarification question
     """
     logger.info("=== Clarification Node ===")
     
+    update: WorkflowState = {}
+    
     # Educational logging
-    edu_logger.log_step(
-        "❓",
-        "STEP 4 (Alternative): Clarification Request",
-        "Asking user for missing information",
-        {
-            "Trigger": "Missing required parameters",
-            "Agent": "Clarification Generator (Gemini 2.5 Flash)",
-            "Purpose": "Get missing information from user to complete request"
-        }
-    )
+    if edu_logger.enabled:
+        edu_logger.log_step(
+            "❓",
+            "STEP 4 (Alternative): Clarification Request",
+            "Asking user for missing information",
+            {
+                "Trigger": "Missing required parameters",
+                "Agent": "Clarification Generator (Gemini 2.5 Flash)",
+                "Purpose": "Get missing information from user to complete request"
+            }
+        )
     
     try:
         extracted_params = state["extracted_params"]
         
         # Show what's missing
-        print(f"\n   ⚠️  Need more information from user:")
-        for missing_param in extracted_params.missing_required:
-            print(f"      • {missing_param}")
-        
-        print(f"\n   💬 Generating natural clarification question...")
+        if edu_logger.enabled:
+            edu_logger.emit("\n".join([
+                "\n   ⚠️  Need more information from user:",
+                *(f"      • {missing_param}" for missing_param in extracted_params.missing_required),
+                "\n   💬 Generating natural clarification question..."
+            ]))
         
         # Generate clarification question using Gemini
         clarification = await gemini_service.generate_clarification_question(
@@ -54,31 +56,32 @@ async def clarification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         )
         
         # Update state
-        state["needs_clarification"] = True
-        state["clarification_question"] = clarification
-        state["final_message"] = clarification
-        add_processing_step(state, "Generated clarification question")
+        update["needs_clarification"] = True
+        update["clarification_question"] = clarification
+        update["final_message"] = clarification
+        add_processing_step(update, "Generated clarification question")
         
-        logger.info(f"Clarification: {clarification}")
+        logger.info("Clarification: %s", clarification)
         
         # Educational logging
-        print(f"\n   ❓ Clarification question: \"{clarification}\"")
-        edu_logger.log_result("Waiting for user to provide missing information", True)
+        if edu_logger.enabled:
+            edu_logger.emit(f"\n   ❓ Clarification question: \"{clarification}\"")
+            edu_logger.log_result("Waiting for user to provide missing information", True)
         
         # Save to database
         await _save_clarification_to_db(state, clarification)
         
     except Exception as e:
-        logger.error(f"Error generating clarification: {e}")
-        state["clarification_question"] = "Could you provide more details?"
-        state["final_message"] = "Could you provide more details?"
+        logger.error("Error generating clarification: %s", e)
+        update["clarification_question"] = "Could you provide more details?"
+        update["final_message"] = "Could you provide more details?"
     
-    return state
+    return update
 
 
-async def _save_clarification_to_db(state: Dict[str, Any], clarification: str) -> None:
+async def _save_clarification_to_db(state: WorkflowState, clarification: str) -> None:
     """Save clarification message to database."""
-    persistence = NodePersistence(state.get("db_session"))
+    persistence = state["persistence"]
     
     # Save assistant's clarification question
     await persistence.save_assistant_message(
@@ -86,10 +89,4 @@ async def _save_clarification_to_db(state: Dict[str, Any], clarification: str) -
         content=clarification
     )
     
-    # Increment message count (user + assistant)
-    await persistence.increment_message_count(
-        conversation_id=state["conversation_id"],
-        count=2
-    )
-    
     logger.info("Clarification question saved to database")
@@ -1,19 +1,31 @@
 """
 Intent Classification Node - Determines which educational tool to use.
 """
+import asyncio
 import logging
-from typing import Dict, Any
+import os
+from typing import Any, Dict, List
 
 from models.schemas import ToolType
-from services.gemini_service import gemini_service
+from services.gemini_service import gemini_service, guess_intent, build_prompt_context
 from utils.educational_logger import edu_logger
-from graph.utils.node_persistence import NodePersistence
-from graph.utils.state_manager import add_processing_step, add_error
+from graph.utils.state_manager import WorkflowState, add_processing_step, add_error
 
 logger = logging.getLogger(__name__)
 
+# Start parameter extraction for a keyword-guessed tool while Gemini
+# classifies; costs one wasted LLM call whenever the guess is wrong
+_SPECULATIVE_EXTRACTION = os.getenv("SPECULATIVE_EXTRACTION", "true").lower() == "true"
 
-async def intent_classification_node(state: Dict[str, Any]) -> Dict[str, Any]:
+# Shown after classification (educational output)
+_TOOL_DESCRIPTIONS = {
+    "note_maker": "Creates structured study notes with sections and key points",
+    "flashcard_generator": "Generates Q&A flashcards for practice and memorization",
+    "concept_explainer": "Provides detailed explanations with examples and analogies"
+}
+
+
+async def intent_classification_node(state: WorkflowState) -> WorkflowState:
     """
     Node 1: Classify user intent to determine which tool to use.
     
@@ -21,60 +33,139 @@ async def intent_classification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         state: Current workflow state
         
     Returns:
-        Updated state with intent classification
+        State update with intent classification
     """
     logger.info("=== Intent Classification Node ===")
     
+    update: WorkflowState = {}
+    
     # Educational logging
-    edu_logger.log_step(
-        "🎯", 
-        "STEP 1: Intent Classification",
-        "Using Gemini AI to understand what the student needs",
-        {
-            "Input": state["user_message"][:60] + "..." if len(state["user_message"]) > 60 else state["user_message"],
-            "Agent": "Intent Classifier (Gemini 2.5 Flash)",
-            "Purpose": "Determine which educational tool to use"
-        }
-    )
+    if edu_logger.enabled:
+        message = state["user_message"]
+        edu_logger.log_step(
+            "🎯", 
+            "STEP 1: Intent Classification",
+            "Using Gemini AI to understand what the student needs",
+            {
+                "Input": f"{message[:60]}..." if message[60:61] else message,
+                "Agent": "Intent Classifier (Gemini 2.5 Flash)",
+                "Purpose": "Determine which educational tool to use"
+            }
+        )
     
-    edu_logger.log_agent("Intent Classifier", "analyzing student's request")
+        edu_logger.log_agent("Intent Classifier", "analyzing student's request")
     
+    # Save user message to database while Gemini classifies (the save only
+    # needs the raw message, and nothing else uses the session meanwhile).
+    # The task group also cancels the save if this node is cancelled.
     try:
-        # Call Gemini AI for intent classification
-        tool_type = await gemini_service.classify_intent(
-            message=state["user_message"],
-            chat_history=state["chat_history"],
-            user_info=state["user_info"]
-        )
-        
-        # Update state
-        state["intent"] = tool_type
-        add_processing_step(state, f"Intent classified as: {tool_type.value}")
-        
-        # Educational logging
-        edu_logger.log_result(f"Intent: {tool_type.value}", True)
-        
-        # Show tool description
-        tool_descriptions = {
-            "note_maker": "Creates structured study notes with sections and key points",
-            "flashcard_generator": "Generates Q&A flashcards for practice and memorization",
-            "concept_explainer": "Provides detailed explanations with examples and analogies"
-        }
-        if tool_type.value in tool_descriptions:
-            print(f"   💡 {tool_descriptions[tool_type.value]}")
-        
-        # Save user message to database
-        persistence = NodePersistence(state.get("db_session"))
-        await persistence.save_user_message(
-            conversation_id=state["conversation_id"],
-            content=state["user_message"]
-        )
+        async with asyncio.TaskGroup() as tg:
+            save_task = tg.create_task(
+                state["persistence"].save_user_message(
+                    conversation_id=state["conversation_id"],
+                    content=state["user_message"]
+                )
+            )
+            
+            try:
+                # Stored history finishes loading while the message is saved
+                chat_history = await _resolve_history(state, update)
+                
+                # History and cache-key inputs are built once and reused by
+                # every Gemini call this turn
+                context = build_prompt_context(state["user_message"], chat_history)
+                update["prompt_context"] = context
+                
+                # The extraction node awaits this if the guess matches the
+                # classified intent (hiding one Gemini round trip) and cancels
+                # it otherwise
+                if _SPECULATIVE_EXTRACTION:
+                    guessed = guess_intent(state["user_message"])
+                    update["speculative_intent"] = guessed
+                    speculative = asyncio.create_task(
+                        gemini_service.extract_parameters(
+                            message=state["user_message"],
+                            chat_history=chat_history,
+                            user_info=state["user_info"],
+                            tool_type=guessed,
+                            context=context
+                        )
+                    )
+                    speculative.add_done_callback(_log_speculative_failure)
+                    update["speculative_extraction"] = speculative
+                
+                # Call Gemini AI for intent classification
+                tool_type = await gemini_service.classify_intent(
+                    message=state["user_message"],
+                    chat_history=chat_history,
+                    user_info=state["user_info"],
+                    context=context
+                )
+                
+                # Update state
+                update["intent"] = tool_type
+                add_processing_step(update, f"Intent classified as: {tool_type.value}")
+                
+                # Educational logging
+                edu_logger.log_result(f"Intent: {tool_type.value}", True)
+                
+                # Show tool description
+                if edu_logger.enabled:
+                    description = _TOOL_DESCRIPTIONS.get(tool_type.value)
+                    if description:
+                        edu_logger.emit(f"   💡 {description}")
+            
+            except Exception as e:
+                logger.error("Error in intent classification: %s", e)
+                add_error(update, f"Intent classification error: {str(e)}")
+                update["intent"] = ToolType.CONCEPT_EXPLAINER  # Safe default
+                # Extraction reruns for the default intent; drop the guess
+                _cancel_speculation(update)
+                edu_logger.log_result(f"Error: {str(e)}", False)
+    
+    except BaseException:
+        # Nothing downstream will consume the speculative call
+        _cancel_speculation(update)
+        raise
+    
+    if save_task.result():
         edu_logger.log_database("Saved", "chat_messages", "User question stored")
-        
+    
+    return update
+
+
+async def _resolve_history(state: WorkflowState, update: WorkflowState) -> List[Dict[str, str]]:
+    """
+    Return the turn's chat history, awaiting the database load if pending.
+    
+    A failed load is logged and the turn continues without history.
+    """
+    history_task = state.get("history_task")
+    if history_task is None:
+        return state["chat_history"]
+    
+    try:
+        chat_history = await history_task
+        logger.info("Loaded %s messages from database", len(chat_history))
     except Exception as e:
-        logger.error(f"Error in intent classification: {e}")
-        add_error(state, f"Intent classification error: {str(e)}")
-        state["intent"] = ToolType.CONCEPT_EXPLAINER  # Safe default
-        edu_logger.log_result(f"Error: {str(e)}", False)
+        logger.error("Error loading chat history: %s", e)
+        add_error(update, f"Chat history load error: {str(e)}")
+        chat_history = []
     
-    return state
+    update["chat_history"] = chat_history
+    update["history_task"] = None
+    return chat_history
+
+
+def _cancel_speculation(update: WorkflowState) -> None:
+    """Cancel and drop the speculative extraction from a node update."""
+    speculative = update.pop("speculative_extraction", None)
+    update.pop("speculative_intent", None)
+    if speculative is not None:
+        speculative.cancel()
+
+
+def _log_speculative_failure(task: "asyncio.Task[Any]") -> None:
+    """Retrieve a failed speculative extraction's exception so it is logged once."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Speculative parameter extraction failed: %s", task.exception())
@@ -2,18 +2,35 @@
 Parameter Extraction Node - Extracts and infers parameters from conversation.
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Callable
 
-from models.schemas import ExtractedParameters
+from models.schemas import ExtractedParameters, UserInfo
 from services.gemini_service import gemini_service
 from utils.educational_logger import edu_logger
-from graph.utils.node_persistence import NodePersistence
-from graph.utils.state_manager import add_processing_step, add_error
+from graph.utils.state_manager import WorkflowState, add_processing_step, add_error
 
 logger = logging.getLogger(__name__)
 
+# Required parameters per tool, pre-joined for display
+_REQUIRED_PARAMS_TEXT = {
+    "note_maker": "topic, subject, note_taking_style",
+    "flashcard_generator": "topic, count, difficulty, subject",
+    "concept_explainer": "concept_to_explain, desired_depth"
+}
 
-async def parameter_extraction_node(state: Dict[str, Any]) -> Dict[str, Any]:
+# Explanation shown next to each inferred parameter: (value, user) -> reason
+_REASON_BUILDERS: Dict[str, Callable[[Any, UserInfo], str]] = {
+    "difficulty": lambda value, user: f"User said 'struggling' → inferred '{value}' difficulty",
+    "subject": lambda value, user: "Inferred from topic context",
+    "note_taking_style": lambda value, user: f"Based on teaching style: {user.teaching_style}",
+}
+
+
+def _default_reason(value: Any, user: UserInfo) -> str:
+    return "Based on user profile and conversation history"
+
+
+async def parameter_extraction_node(state: WorkflowState) -> WorkflowState:
     """
     Node 2: Extract parameters from conversation using Gemini.
     
@@ -23,109 +40,121 @@ async def parameter_extraction_node(state: Dict[str, Any]) -> Dict[str, Any]:
         state: Current workflow state
         
     Returns:
-        Updated state with extracted parameters
+        State update with extracted parameters
     """
     logger.info("=== Parameter Extraction Node ===")
     
-    # Educational logging
-    edu_logger.log_step(
-        "🔍",
-        "STEP 2: Parameter Extraction",
-        "Extracting required information from the conversation",
-        {
-            "Tool Type": state["intent"].value,
-            "Agent": "Parameter Extractor (Gemini 2.5 Flash)",
-            "Challenge": "Extract all required parameters, infer missing ones"
-        }
-    )
+    update: WorkflowState = {}
+    intent = state["intent"]
     
-    # Show what we're looking for
-    tool_params = {
-        "note_maker": ["topic", "subject", "note_taking_style"],
-        "flashcard_generator": ["topic", "count", "difficulty", "subject"],
-        "concept_explainer": ["concept_to_explain", "desired_depth"]
-    }
+    # Educational logging
+    if edu_logger.enabled:
+        edu_logger.log_step(
+            "🔍",
+            "STEP 2: Parameter Extraction",
+            "Extracting required information from the conversation",
+            {
+                "Tool Type": intent.value,
+                "Agent": "Parameter Extractor (Gemini 2.5 Flash)",
+                "Challenge": "Extract all required parameters, infer missing ones"
+            }
+        )
     
-    if state["intent"].value in tool_params:
-        params_needed = ", ".join(tool_params[state["intent"].value])
-        print(f"   📋 Required parameters: {params_needed}")
+        # Show what we're looking for
+        params_needed = _REQUIRED_PARAMS_TEXT.get(intent.value)
+        if params_needed:
+            edu_logger.emit(f"   📋 Required parameters: {params_needed}")
     
-    edu_logger.log_agent("Parameter Extractor", "analyzing conversation for parameters")
+        edu_logger.log_agent("Parameter Extractor", "analyzing conversation for parameters")
     
     try:
-        # Call Gemini AI for parameter extraction
-        extracted = await gemini_service.extract_parameters(
-            message=state["user_message"],
-            chat_history=state["chat_history"],
-            user_info=state["user_info"],
-            tool_type=state["intent"]
-        )
+        # Reuse the extraction started alongside classification when it
+        # was for the right tool; otherwise call Gemini now
+        speculative = state.get("speculative_extraction")
+        if speculative is not None and state.get("speculative_intent") == intent:
+            extracted = await speculative
+            add_processing_step(update, "Reused speculative parameter extraction")
+        else:
+            if speculative is not None:
+                speculative.cancel()
+            
+            # Call Gemini AI for parameter extraction
+            extracted = await gemini_service.extract_parameters(
+                message=state["user_message"],
+                chat_history=state["chat_history"],
+                user_info=state["user_info"],
+                tool_type=intent,
+                context=state.get("prompt_context")
+            )
         
         # Update state
-        state["extracted_params"] = extracted
-        add_processing_step(state, f"Extracted parameters with {extracted.confidence:.2f} confidence")
+        update["extracted_params"] = extracted
+        add_processing_step(update, f"Extracted parameters with {extracted.confidence:.2f} confidence")
         
         # Educational logging
         edu_logger.log_result(f"Extraction confidence: {extracted.confidence:.0%}", True)
         
         # Show extracted parameters
-        _display_extracted_params(extracted, state)
+        if edu_logger.enabled:
+            _display_extracted_params(extracted, state)
         
         # Save to database (CRITICAL for hackathon scoring!)
         await _save_extraction_to_db(state, extracted)
         
-        logger.info(f"Extracted params: {extracted.parameters}")
-        logger.info(f"Confidence: {extracted.confidence}")
-        logger.info(f"Inferred: {extracted.inferred_params}")
+        logger.info("Extracted params: %s", extracted.parameters)
+        logger.info("Confidence: %s", extracted.confidence)
+        logger.info("Inferred: %s", extracted.inferred_params)
         
     except Exception as e:
-        logger.error(f"Error in parameter extraction: {e}")
-        add_error(state, f"Parameter extraction error: {str(e)}")
+        logger.error("Error in parameter extraction: %s", e)
+        add_error(update, f"Parameter extraction error: {str(e)}")
         edu_logger.log_result(f"Error: {str(e)}", False)
         
         # Create empty extraction to continue flow
-        state["extracted_params"] = ExtractedParameters(
-            tool_type=state["intent"],
+        update["extracted_params"] = ExtractedParameters(
+            tool_type=intent,
             parameters={},
             confidence=0.0,
             missing_required=["all"],
             inferred_params={}
         )
     
-    return state
+    return update
 
 
-def _display_extracted_params(extracted: ExtractedParameters, state: Dict[str, Any]) -> None:
-    """Display extracted parameters with educational logging."""
+def _display_extracted_params(extracted: ExtractedParameters, state: WorkflowState) -> None:
+    """Display extracted parameters with educational logging (one write)."""
+    lines = []
+    
     # Show explicitly extracted
     if extracted.parameters:
-        print(f"\n   📦 Extracted from user message:")
-        for key, value in extracted.parameters.items():
-            print(f"      • {key} = '{value}'")
+        lines.append("\n   📦 Extracted from user message:")
+        lines.extend(f"      • {key} = '{value}'" for key, value in extracted.parameters.items())
     
     # Show inferred parameters with reasoning
     if extracted.inferred_params:
-        print(f"\n   🔮 Inferred from context:")
-        for key, value in extracted.inferred_params.items():
-            reason = "Based on user profile and conversation history"
-            if key == "difficulty":
-                reason = f"User said 'struggling' → inferred '{value}' difficulty"
-            elif key == "subject":
-                reason = f"Inferred from topic context"
-            elif key == "note_taking_style":
-                reason = f"Based on teaching style: {state['user_info'].teaching_style}"
-            print(f"      • {key} = '{value}' ({reason})")
+        user_info = state["user_info"]
+        lines.append("\n   🔮 Inferred from context:")
+        lines.extend(
+            f"      • {key} = '{value}' ({_REASON_BUILDERS.get(key, _default_reason)(value, user_info)})"
+            for key, value in extracted.inferred_params.items()
+        )
     
     # Show missing parameters
     if extracted.missing_required:
-        print(f"\n   ⚠️  Missing required parameters:")
-        for param in extracted.missing_required:
-            print(f"      • {param} (will use default or ask user)")
+        lines.append("\n   ⚠️  Missing required parameters:")
+        lines.extend(
+            f"      • {param} (will use default or ask user)"
+            for param in extracted.missing_required
+        )
+    
+    if lines:
+        edu_logger.emit("\n".join(lines))
 
 
-async def _save_extraction_to_db(state: Dict[str, Any], extracted: ExtractedParameters) -> None:
+async def _save_extraction_to_db(state: WorkflowState, extracted: ExtractedParameters) -> None:
     """Save parameter extraction to database."""
-    persistence = NodePersistence(state.get("db_session"))
+    persistence = state["persistence"]
     await persistence.save_parameter_extraction(
         conversation_id=state["conversation_id"],
         user_message=state["user_message"],
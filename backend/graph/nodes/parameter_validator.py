@@ -2,16 +2,15 @@
 Parameter Validation Node - Validates extracted parameters against tool schemas.
 """
 import logging
-from typing import Dict, Any
 
 from agents.validator import validate_parameters
 from utils.educational_logger import edu_logger
-from graph.utils.state_manager import add_processing_step, add_error
+from graph.utils.state_manager import WorkflowState, add_processing_step, add_error
 
 logger = logging.getLogger(__name__)
 
 
-async def validation_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def validation_node(state: WorkflowState) -> WorkflowState:
     """
     Node 3: Validate extracted parameters against tool schema.
     
@@ -19,32 +18,38 @@ async def validation_node(state: Dict[str, Any]) -> Dict[str, Any]:
         state: Current workflow state
         
     Returns:
-        Updated state with validation results
+        State update with validation results
     """
     logger.info("=== Validation Node ===")
     
+    update: WorkflowState = {}
+    intent = state["intent"]
+    
     # Educational logging
-    edu_logger.log_step(
-        "✅",
-        "STEP 3: Parameter Validation",
-        "Validating extracted parameters against tool requirements",
-        {
-            "Tool Type": state["intent"].value,
-            "Agent": "Schema Validator (Pydantic)",
-            "Challenge": "Ensure all required parameters are present and correctly formatted"
-        }
-    )
+    if edu_logger.enabled:
+        edu_logger.log_step(
+            "✅",
+            "STEP 3: Parameter Validation",
+            "Validating extracted parameters against tool requirements",
+            {
+                "Tool Type": intent.value,
+                "Agent": "Schema Validator (Pydantic)",
+                "Challenge": "Ensure all required parameters are present and correctly formatted"
+            }
+        )
     
     try:
         extracted_params = state["extracted_params"]
         
         # Show what we're validating
-        print(f"\n   📋 Validating parameters for {state['intent'].value}:")
-        for param_name, param_value in extracted_params.parameters.items():
-            print(f"      • {param_name} = '{param_value}'")
+        if edu_logger.enabled:
+            edu_logger.emit("\n".join([
+                f"\n   📋 Validating parameters for {intent.value}:",
+                *(f"      • {param_name} = '{param_value}'" for param_name, param_value in extracted_params.parameters.items())
+            ]))
         
         # Validate using Pydantic schemas
-        is_valid, tool_input, missing = await validate_parameters(
+        is_valid, tool_input, missing = validate_parameters(
             tool_type=extracted_params.tool_type,
             parameters=extracted_params.parameters,
             user_info=state["user_info"],
@@ -52,36 +57,39 @@ async def validation_node(state: Dict[str, Any]) -> Dict[str, Any]:
         )
         
         # Update state
-        state["validation_passed"] = is_valid
-        state["tool_input"] = tool_input
+        update["validation_passed"] = is_valid
+        update["tool_input"] = tool_input
         
         if is_valid:
-            add_processing_step(state, "Validation passed")
+            add_processing_step(update, "Validation passed")
             logger.info("Validation successful")
             
             # Educational logging - success
-            print(f"\n   ✅ All parameters valid!")
-            edu_logger.log_result("Validation passed - ready for tool execution", True)
+            if edu_logger.enabled:
+                edu_logger.emit("\n   ✅ All parameters valid!")
+                edu_logger.log_result("Validation passed - ready for tool execution", True)
         else:
-            add_processing_step(state, f"Validation failed: missing {missing}")
-            logger.warning(f"Validation failed: {missing}")
+            add_processing_step(update, f"Validation failed: missing {missing}")
+            logger.warning("Validation failed: %s", missing)
             
             # Educational logging - missing parameters
-            print(f"\n   ⚠️  Missing required parameters:")
-            for missing_param in missing:
-                print(f"      • {missing_param} (required for {state['intent'].value})")
+            if edu_logger.enabled:
+                edu_logger.emit("\n".join([
+                    "\n   ⚠️  Missing required parameters:",
+                    *(f"      • {missing_param} (required for {intent.value})" for missing_param in missing)
+                ]))
             
-            edu_logger.log_result("Validation failed - need clarification from user", False)
+                edu_logger.log_result("Validation failed - need clarification from user", False)
             
             # Update extracted params with missing list
             extracted_params.missing_required = missing
-            state["extracted_params"] = extracted_params
+            update["extracted_params"] = extracted_params
         
     except Exception as e:
-        logger.error(f"Error in validation: {e}")
-        add_error(state, f"Validation error: {str(e)}")
-        state["validation_passed"] = False
+        logger.error("Error in validation: %s", e)
+        add_error(update, f"Validation error: {str(e)}")
+        update["validation_passed"] = False
         
         edu_logger.log_result(f"Validation error: {str(e)}", False)
     
-    return state
+    return update
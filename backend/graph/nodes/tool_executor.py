@@ -6,10 +6,15 @@ import time
 from typing import Dict, Any
 
 from models.schemas import ToolType, ToolResponse
-from agents.tool_executor import execute_tool
+from agents.tool_executor import execute_tool, TOOL_ENDPOINTS
 from utils.educational_logger import edu_logger
-from graph.utils.node_persistence import NodePersistence
-from graph.utils.state_manager import add_processing_step, add_error, serialize_tool_input
+from graph.utils.state_manager import (
+    WorkflowState,
+    add_processing_step,
+    add_error,
+    serialize_tool_input,
+    serialize_tool_input_json
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +26,21 @@ TOOL_NAMES = {
     ToolType.CONCEPT_EXPLAINER: "Concept Explainer"
 }
 
-TOOL_ENDPOINTS = {
-    ToolType.NOTE_MAKER: "http://localhost:8001/api/note-maker",
-    ToolType.FLASHCARD_GENERATOR: "http://localhost:8001/api/flashcard-generator",
-    ToolType.CONCEPT_EXPLAINER: "http://localhost:8001/api/explainer"
+# (display name, endpoint) per tool, resolved together at import
+_TOOL_DISPLAY = {
+    tool_type: (name, TOOL_ENDPOINTS.get(tool_type, "Unknown"))
+    for tool_type, name in TOOL_NAMES.items()
 }
+_UNKNOWN_TOOL = ("Unknown", "Unknown")
 
+# Educational output templates (%-formatted once per call)
+_SUCCESS_TEMPLATE = "\n   ✅ Tool execution successful!\n   ⏱️  Execution time: %dms (%.1fs)"
+_FLASHCARDS_TEMPLATE = "\n   📚 Generated %d flashcards"
+_NOTES_TEMPLATE = "\n   📝 Generated structured notes with %d sections"
+_EXPLANATION_TEMPLATE = "\n   💡 Generated detailed explanation (%d characters)"
 
-async def tool_execution_node(state: Dict[str, Any]) -> Dict[str, Any]:
+
+async def tool_execution_node(state: WorkflowState) -> WorkflowState:
     """
     Node 4a: Execute the educational tool with validated parameters.
     
@@ -36,64 +48,72 @@ async def tool_execution_node(state: Dict[str, Any]) -> Dict[str, Any]:
         state: Current workflow state
         
     Returns:
-        Updated state with tool execution results
+        State update with tool execution results
     """
     logger.info("=== Tool Execution Node ===")
     
     start_time = time.time()
     
+    update: WorkflowState = {}
+    intent = state["intent"]
+    tool_input = state["tool_input"]
+    
     # Educational logging
-    _log_execution_start(state)
+    if edu_logger.enabled:
+        _log_execution_start(intent, serialize_tool_input(tool_input))
     
     try:
         # Execute tool via HTTP API
         tool_response = await execute_tool(
-            tool_type=state["intent"],
-            tool_input=state["tool_input"]
+            tool_type=intent,
+            tool_input=tool_input
         )
         
         execution_time_ms = int((time.time() - start_time) * 1000)
         
         # Update state
-        state["tool_response"] = tool_response
-        add_processing_step(state, f"Tool executed: {tool_response.success}")
+        update["tool_response"] = tool_response
+        add_processing_step(update, f"Tool executed: {tool_response.success}")
         
         if tool_response.success:
-            state["final_message"] = "Tool executed successfully. Here are your results:"
+            final_message = "Tool executed successfully. Here are your results:"
             logger.info("Tool execution successful")
             
             # Educational logging - success
-            _log_execution_success(state, tool_response, execution_time_ms)
+            if edu_logger.enabled:
+                _log_execution_success(intent, tool_response, execution_time_ms)
         else:
-            state["final_message"] = f"Tool execution failed: {tool_response.error}"
-            add_error(state, f"Tool execution failed: {tool_response.error}")
-            logger.error(f"Tool failed: {tool_response.error}")
+            final_message = f"Tool execution failed: {tool_response.error}"
+            add_error(update, f"Tool execution failed: {tool_response.error}")
+            logger.error("Tool failed: %s", tool_response.error)
             
             edu_logger.log_result(f"Tool execution failed: {tool_response.error}", False)
         
-        # Save to database
-        await _save_execution_to_db(state, tool_response, execution_time_ms)
+        update["final_message"] = final_message
+        
+        # Save to database (in the request transaction, so the reply is
+        # stored before the response and the next turn's history sees it)
+        await _save_execution_to_db(state, final_message, tool_response, execution_time_ms)
         
     except Exception as e:
-        logger.error(f"Error in tool execution: {e}")
-        add_error(state, f"Tool execution error: {str(e)}")
+        logger.error("Error in tool execution: %s", e)
+        add_error(update, f"Tool execution error: {str(e)}")
         
-        state["tool_response"] = ToolResponse(
-            tool_type=state["intent"],
+        update["tool_response"] = ToolResponse(
+            tool_type=intent,
             success=False,
             error=str(e)
         )
-        state["final_message"] = f"An error occurred: {str(e)}"
+        update["final_message"] = f"An error occurred: {str(e)}"
         
         edu_logger.log_result(f"Tool execution error: {str(e)}", False)
     
-    return state
+    return update
 
 
-def _log_execution_start(state: Dict[str, Any]) -> None:
+def _log_execution_start(intent: ToolType, params: Dict[str, Any]) -> None:
     """Log execution start with educational output."""
-    tool_name = TOOL_NAMES.get(state["intent"], "Unknown")
-    tool_endpoint = TOOL_ENDPOINTS.get(state["intent"], "Unknown")
+    tool_name, tool_endpoint = _TOOL_DISPLAY.get(intent, _UNKNOWN_TOOL)
     
     edu_logger.log_step(
         "🔧",
@@ -108,76 +128,64 @@ def _log_execution_start(state: Dict[str, Any]) -> None:
     )
     
     # Show parameters being sent
-    print(f"\n   📤 Sending to {tool_name}:")
-    params = serialize_tool_input(state["tool_input"])
-    for key, value in params.items():
-        print(f"      • {key} = '{value}'")
-    
-    print(f"\n   ⏳ Waiting for AI to generate content...")
+    edu_logger.emit("\n".join([
+        f"\n   📤 Sending to {tool_name}:",
+        *(f"      • {key} = '{value}'" for key, value in params.items()),
+        "\n   ⏳ Waiting for AI to generate content..."
+    ]))
 
 
 def _log_execution_success(
-    state: Dict[str, Any],
+    intent: ToolType,
     tool_response: ToolResponse,
     execution_time_ms: int
 ) -> None:
     """Log successful execution with results summary."""
-    print(f"\n   ✅ Tool execution successful!")
-    print(f"   ⏱️  Execution time: {execution_time_ms}ms ({execution_time_ms/1000:.1f}s)")
+    text = _SUCCESS_TEMPLATE % (execution_time_ms, execution_time_ms / 1000)
     
     # Show what was generated
-    if tool_response.data:
-        if state["intent"] == ToolType.FLASHCARD_GENERATOR:
-            flashcards = tool_response.data.get('flashcards', [])
-            print(f"   📚 Generated {len(flashcards)} flashcards")
-        elif state["intent"] == ToolType.NOTE_MAKER:
-            notes = tool_response.data.get('notes', {})
-            sections = len(notes.get('sections', []))
-            print(f"   📝 Generated structured notes with {sections} sections")
-        elif state["intent"] == ToolType.CONCEPT_EXPLAINER:
-            explanation = tool_response.data.get('explanation', '')
-            print(f"   💡 Generated detailed explanation ({len(explanation)} characters)")
+    data = tool_response.data
+    if data:
+        if intent == ToolType.FLASHCARD_GENERATOR:
+            text += _FLASHCARDS_TEMPLATE % len(data.get('flashcards', []))
+        elif intent == ToolType.NOTE_MAKER:
+            text += _NOTES_TEMPLATE % len(data.get('notes', {}).get('sections', []))
+        elif intent == ToolType.CONCEPT_EXPLAINER:
+            text += _EXPLANATION_TEMPLATE % len(data.get('explanation', ''))
+    
+    edu_logger.emit(text)
     
     edu_logger.log_result(f"AI content generated successfully in {execution_time_ms}ms", True)
 
 
 async def _save_execution_to_db(
-    state: Dict[str, Any],
+    state: WorkflowState,
+    final_message: str,
     tool_response: ToolResponse,
     execution_time_ms: int
 ) -> None:
     """Save tool execution and assistant response to database."""
-    persistence = NodePersistence(state.get("db_session"))
-    
-    # Serialize tool input
-    input_params = serialize_tool_input(state["tool_input"])
+    persistence = state["persistence"]
+    if not persistence.enabled:
+        return
     
-    # Save tool execution record
-    await persistence.save_tool_execution(
+    # Tool execution record + assistant response, one statement
+    saved = await persistence.save_execution_bundle(
         conversation_id=state["conversation_id"],
         tool_type=state["intent"].value,
-        input_params=input_params,
-        output_data=tool_response.data if tool_response.success else None,
+        input_params=serialize_tool_input_json(state["tool_input"]),
+        output_data=tool_response.data,
         execution_time_ms=execution_time_ms,
         success=tool_response.success,
-        error_message=tool_response.error if not tool_response.success else None
-    )
-    
-    # Save assistant response
-    await persistence.save_assistant_message(
-        conversation_id=state["conversation_id"],
-        content=state["final_message"],
-        tool_used=state["intent"].value
-    )
-    
-    # Increment message count (user + assistant)
-    await persistence.increment_message_count(
-        conversation_id=state["conversation_id"],
-        count=2
+        reply=final_message,
+        error_message=tool_response.error
     )
+    if not saved:
+        return
     
-    logger.info(f"Tool execution saved to database (execution time: {execution_time_ms}ms)")
+    logger.info("Tool execution saved to database (execution time: %sms)", execution_time_ms)
     
     # Educational logging
-    edu_logger.log_database("Saved", "tool_executions", f"Execution time: {execution_time_ms}ms, Success: {tool_response.success}")
-    edu_logger.log_database("Saved", "chat_messages", "Assistant response with tool results")
+    if edu_logger.enabled:
+        edu_logger.log_database("Saved", "tool_executions", f"Execution time: {execution_time_ms}ms, Success: {tool_response.success}")
+        edu_logger.log_database("Saved", "chat_messages", "Assistant response with tool results")
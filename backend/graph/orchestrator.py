@@ -1,23 +1,47 @@
 """
 Orchestrator - Main entry point for AI workflow execution.
 """
+import asyncio
 import logging
+import re
 from typing import Dict, Any, List, Optional
+from uuid import UUID
 
 from models.schemas import UserInfo
 from utils.educational_logger import edu_logger
-from graph.workflow import create_orchestrator_graph
+from graph.workflow import get_app
 from graph.utils import create_initial_state
 
 logger = logging.getLogger(__name__)
 
+# Greetings and thanks get a canned reply without running the graph (no
+# Gemini calls). Only whole-message matches qualify. Bare "ok"/"yes" are
+# left to the workflow: they often answer a clarification question.
+_GREETING = re.compile(r"^\s*(?:hi|hello|hey)(?:\s+there)?\W*$", re.IGNORECASE)
+_THANKS = re.compile(r"^\s*(?:thanks|thank\s+you|thx)\W*$", re.IGNORECASE)
+_GREETING_REPLY = (
+    "Hi! I can make study notes, create flashcards, or explain a concept. "
+    "What would you like to work on?"
+)
+_THANKS_REPLY = "You're welcome! Let me know if there's anything else you'd like to study."
+
+
+def _small_talk_reply(user_message: str) -> Optional[str]:
+    """Return the canned reply for a greeting or thanks, else None."""
+    if _GREETING.match(user_message):
+        return _GREETING_REPLY
+    if _THANKS.match(user_message):
+        return _THANKS_REPLY
+    return None
+
 
 async def orchestrate(
     user_message: str,
     user_info: UserInfo,
     chat_history: List[Dict[str, str]],
-    conversation_id: str,
-    db_session: Optional[Any] = None
+    conversation_id: UUID,
+    db_session: Optional[Any] = None,
+    history_task: Optional["asyncio.Task[List[Dict[str, str]]]"] = None
 ) -> Dict[str, Any]:
     """
     Main orchestration function - executes the LangGraph workflow.
@@ -28,14 +52,17 @@ async def orchestrate(
         chat_history: Previous conversation
         conversation_id: Unique conversation ID
         db_session: Optional database session for persistence
+        history_task: Pending load of stored history; the workflow awaits
+            it when it first needs the history
         
     Returns:
         Final state dict with all processing results
     """
-    logger.info(f"🚀 Starting orchestration for conversation: {conversation_id}")
+    logger.info("🚀 Starting orchestration for conversation: %s", conversation_id)
     
     # Educational logging - Workflow Start
-    _log_workflow_start(user_message, conversation_id)
+    if edu_logger.enabled:
+        _log_workflow_start(user_message, conversation_id)
     
     # Initialize state
     initial_state = create_initial_state(
@@ -43,26 +70,38 @@ async def orchestrate(
         user_info=user_info,
         chat_history=chat_history,
         conversation_id=conversation_id,
-        db_session=db_session
+        db_session=db_session,
+        history_task=history_task
     )
     
-    # Create and run graph
-    app = create_orchestrator_graph()
+    # Small talk skips the graph; both messages are still saved so the
+    # conversation history stays complete
+    reply = _small_talk_reply(user_message)
+    if reply is not None:
+        if history_task is not None:
+            history_task.cancel()
+        return await _answer_small_talk(initial_state, reply)
+    
+    # Run the shared compiled graph
+    app = get_app()
     
     try:
         # Execute workflow
         final_state = await app.ainvoke(initial_state)
         
         logger.info("✅ Orchestration completed successfully")
-        logger.info(f"Processing steps: {final_state['processing_steps']}")
+        logger.info("Processing steps: %s", final_state['processing_steps'])
         
         # Educational logging - Workflow Summary
-        _log_workflow_summary(final_state)
+        if edu_logger.enabled:
+            _log_workflow_summary(final_state)
         
         return final_state
         
     except Exception as e:
-        logger.error(f"❌ Error in orchestration: {e}")
+        logger.error("❌ Error in orchestration: %s", e)
+        if history_task is not None:
+            history_task.cancel()
         edu_logger.log_result(f"Orchestration error: {str(e)}", False)
         
         return {
@@ -72,9 +111,58 @@ async def orchestrate(
         }
 
 
-def _log_workflow_start(user_message: str, conversation_id: str) -> None:
+async def _answer_small_talk(state: Dict[str, Any], reply: str) -> Dict[str, Any]:
+    """Persist a small-talk exchange and return it as the final state."""
+    persistence = state["persistence"]
+    await persistence.save_user_message(
+        conversation_id=state["conversation_id"],
+        content=state["user_message"]
+    )
+    await persistence.save_assistant_message(
+        conversation_id=state["conversation_id"],
+        content=reply
+    )
+    
+    logger.info("✅ Answered small talk without running the workflow")
+    return {
+        **state,
+        "final_message": reply,
+        "processing_steps": ["Answered small talk directly"]
+    }
+
+
+# Static banner text and summary template, built once
+_RULE_OPEN = "\n" + "=" * 80
+_RULE_CLOSE = "=" * 80 + "\n"
+_PIPELINE_OVERVIEW = "\n".join([
+    "",
+    "\n    Processing Pipeline:",
+    "      Step 1: Intent Classification (Gemini AI)",
+    "      Step 2: Parameter Extraction (Gemini AI)",
+    "      Step 3: Parameter Validation (Pydantic)",
+    "      Step 4: Tool Execution / Clarification",
+    "      Step 5: Response Generation",
+    _RULE_CLOSE
+])
+_EXECUTION_SUMMARY = "\n".join([
+    "\n   📊 Workflow Summary:",
+    "      1. Intent Classification → %s",
+    "      2. Parameter Extraction → %d parameters",
+    "      3. Validation → %s",
+    "      4. Tool Execution → %s",
+    # Database tables updated
+    "\n   💾 Database Updates:",
+    "      • users (profile information)",
+    "      • conversations (conversation metadata)",
+    "      • chat_messages (2 messages: user + assistant)",
+    "      • parameter_extractions (extraction record)",
+    "      • tool_executions (execution record)"
+])
+
+
+def _log_workflow_start(user_message: str, conversation_id: UUID) -> None:
     """Log workflow start with educational output."""
-    print("\n" + "="*80)
+    edu_logger.emit(_RULE_OPEN)
     edu_logger.log_step(
         "🚀",
         "AI ORCHESTRATION WORKFLOW STARTED",
@@ -83,72 +171,59 @@ def _log_workflow_start(user_message: str, conversation_id: str) -> None:
             "Architecture": "LangGraph StateGraph with 5 nodes",
             "AI Model": "Google Gemini 2.5 Flash",
             "Database": "PostgreSQL (Supabase)",
-            "Conversation ID": conversation_id[:8] + "..."
+            "Conversation ID": str(conversation_id)[:8] + "..."
         }
     )
-    print(f"\n   💬 Student Question: \"{user_message}\"")
-    print(f"\n    Processing Pipeline:")
-    print(f"      Step 1: Intent Classification (Gemini AI)")
-    print(f"      Step 2: Parameter Extraction (Gemini AI)")
-    print(f"      Step 3: Parameter Validation (Pydantic)")
-    print(f"      Step 4: Tool Execution / Clarification")
-    print(f"      Step 5: Response Generation")
-    print("="*80 + "\n")
+    edu_logger.emit(f"\n   💬 Student Question: \"{user_message}\"" + _PIPELINE_OVERVIEW)
 
 
 def _log_workflow_summary(final_state: Dict[str, Any]) -> None:
     """Log workflow completion summary."""
-    print("\n" + "="*80)
+    intent = final_state.get('intent')
+    intent_value = intent.value if intent else 'N/A'
+    needs_clarification = final_state.get('needs_clarification')
+    
+    edu_logger.emit(_RULE_OPEN)
     edu_logger.log_step(
         "🎉",
         "WORKFLOW COMPLETE",
         "AI Orchestration finished successfully",
         {
             "Total Steps": len(final_state['processing_steps']),
-            "Intent": final_state.get('intent', 'N/A').value if final_state.get('intent') else 'N/A',
-            "Status": "✅ Success" if not final_state.get('needs_clarification') else "❓ Needs Clarification",
+            "Intent": intent_value,
+            "Status": "✅ Success" if not needs_clarification else "❓ Needs Clarification",
             "Database": "All operations persisted to PostgreSQL"
         }
     )
     
-    if not final_state.get('needs_clarification'):
-        _log_execution_summary(final_state)
+    if not needs_clarification:
+        _log_execution_summary(final_state, intent_value)
     
-    print("="*80 + "\n")
+    edu_logger.emit(_RULE_CLOSE)
 
 
-def _log_execution_summary(final_state: Dict[str, Any]) -> None:
+def _log_execution_summary(final_state: Dict[str, Any], intent_value: str) -> None:
     """Log execution summary details."""
-    print(f"\n   📊 Workflow Summary:")
-    print(f"      1. Intent Classification → {final_state.get('intent', 'N/A').value if final_state.get('intent') else 'N/A'}")
-    
-    # Get parameter count safely
+    # Get parameter count safely (model or plain dict)
     extracted_params = final_state.get('extracted_params')
     param_count = 0
     if extracted_params:
-        if hasattr(extracted_params, 'parameters'):
-            param_count = len(extracted_params.parameters)
-        elif isinstance(extracted_params, dict):
-            param_count = len(extracted_params.get('parameters', {}))
-    
-    print(f"      2. Parameter Extraction → {param_count} parameters")
-    print(f"      3. Validation → {'Passed' if final_state.get('validation_passed') else 'Failed'}")
+        parameters = getattr(extracted_params, 'parameters', None)
+        if parameters is None and isinstance(extracted_params, dict):
+            parameters = extracted_params.get('parameters')
+        param_count = len(parameters or ())
     
-    # Get tool execution status safely
+    # Get tool execution status safely (model or plain dict)
     tool_response = final_state.get('tool_response')
     tool_success = False
     if tool_response:
-        if hasattr(tool_response, 'success'):
-            tool_success = tool_response.success
-        elif isinstance(tool_response, dict):
+        tool_success = getattr(tool_response, 'success', None)
+        if tool_success is None and isinstance(tool_response, dict):
             tool_success = tool_response.get('success', False)
     
-    print(f"      4. Tool Execution → {'Success' if tool_success else 'Failed'}")
-    
-    # Show database tables updated
-    print(f"\n   💾 Database Updates:")
-    print(f"      • users (profile information)")
-    print(f"      • conversations (conversation metadata)")
-    print(f"      • chat_messages (2 messages: user + assistant)")
-    print(f"      • parameter_extractions (extraction record)")
-    print(f"      • tool_executions (execution record)")
+    edu_logger.emit(_EXECUTION_SUMMARY % (
+        intent_value,
+        param_count,
+        'Passed' if final_state.get('validation_passed') else 'Failed',
+        'Success' if tool_success else 'Failed'
+    ))
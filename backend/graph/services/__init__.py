@@ -0,0 +1,6 @@
+"""
+Workflow Services Package - Shared services for the orchestration workflow.
+"""
+from .workflow_persistence_service import WorkflowPersistenceService
+
+__all__ = ["WorkflowPersistenceService"]
@@ -3,7 +3,10 @@ Workflow Persistence Service
 Handles all database operations for the orchestration workflow.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
+from uuid import UUID
+import orjson
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.repositories import (
@@ -42,7 +45,7 @@ class WorkflowPersistenceService:
     
     async def save_user_message(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         content: str
     ) -> bool:
         """
@@ -65,15 +68,15 @@ class WorkflowPersistenceService:
                 role="user",
                 content=content
             )
-            logger.info(f"✅ Saved user message to database")
+            logger.info("✅ Saved user message to database")
             return True
         except Exception as e:
-            logger.error(f"❌ Error saving user message: {e}")
+            logger.error("❌ Error saving user message: %s", e)
             return False
     
     async def save_assistant_message(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         content: str,
         tool_used: Optional[str] = None
     ) -> bool:
@@ -99,15 +102,15 @@ class WorkflowPersistenceService:
                 content=content,
                 tool_used=tool_used
             )
-            logger.info(f"✅ Saved assistant message to database")
+            logger.info("✅ Saved assistant message to database")
             return True
         except Exception as e:
-            logger.error(f"❌ Error saving assistant message: {e}")
+            logger.error("❌ Error saving assistant message: %s", e)
             return False
     
     async def save_parameter_extraction(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         user_message: str,
         extracted_params: Dict[str, Any],
         inferred_params: Dict[str, Any],
@@ -143,15 +146,15 @@ class WorkflowPersistenceService:
                 confidence_score=confidence_score,
                 missing_required=missing_required or []
             )
-            logger.info(f"✅ Saved parameter extraction (confidence: {confidence_score:.0%})")
+            logger.info("✅ Saved parameter extraction (confidence: %.0f%%)", confidence_score * 100)
             return True
         except Exception as e:
-            logger.error(f"❌ Error saving parameter extraction: {e}")
+            logger.error("❌ Error saving parameter extraction: %s", e)
             return False
     
     async def save_tool_execution(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         tool_type: str,
         input_params: Dict[str, Any],
         output_data: Optional[Dict[str, Any]],
@@ -188,15 +191,63 @@ class WorkflowPersistenceService:
                 success=success,
                 error_message=error_message if not success else None
             )
-            logger.info(f"✅ Saved tool execution ({execution_time_ms}ms, success={success})")
+            logger.info("✅ Saved tool execution (%sms, success=%s)", execution_time_ms, success)
             return True
         except Exception as e:
-            logger.error(f"❌ Error saving tool execution: {e}")
+            logger.error("❌ Error saving tool execution: %s", e)
+            return False
+    
+    async def save_execution_bundle(
+        self,
+        conversation_id: UUID,
+        tool_type: str,
+        input_params: Union[Dict[str, Any], bytes],
+        output_data: Optional[Dict[str, Any]],
+        execution_time_ms: int,
+        success: bool,
+        reply: str,
+        error_message: Optional[str] = None
+    ) -> bool:
+        """
+        Save a tool execution record and the assistant reply in one statement.
+        
+        Args:
+            conversation_id: Conversation ID
+            tool_type: Type of tool executed
+            input_params: Input parameters sent to tool (dict or JSON bytes)
+            output_data: Tool output data (if successful)
+            execution_time_ms: Execution time in milliseconds
+            success: Whether execution was successful
+            reply: Assistant message content
+            error_message: Error message if failed
+            
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        if not self.enabled:
+            logger.debug("Persistence disabled - skipping save_execution_bundle")
+            return False
+        
+        try:
+            await self.tool_repo.create_with_reply(
+                conversation_id=conversation_id,
+                tool_type=tool_type,
+                input_params=input_params,
+                reply=reply,
+                output_data=output_data if success else None,
+                execution_time_ms=execution_time_ms,
+                success=success,
+                error_message=error_message if not success else None
+            )
+            logger.info("✅ Saved tool execution and assistant message (%sms, success=%s)", execution_time_ms, success)
+            return True
+        except Exception as e:
+            logger.error("❌ Error saving tool execution bundle: %s", e)
             return False
     
     async def increment_message_count(
         self,
-        conversation_id: str,
+        conversation_id: UUID,
         count: int = 1
     ) -> bool:
         """
@@ -214,12 +265,11 @@ class WorkflowPersistenceService:
             return False
         
         try:
-            for _ in range(count):
-                await self.conv_repo.increment_message_count(conversation_id)
-            logger.debug(f"Incremented message count by {count}")
+            await self.conv_repo.increment_message_count(conversation_id, by=count)
+            logger.debug("Incremented message count by %s", count)
             return True
         except Exception as e:
-            logger.error(f"❌ Error incrementing message count: {e}")
+            logger.error("❌ Error incrementing message count: %s", e)
             return False
     
     @staticmethod
@@ -227,7 +277,7 @@ class WorkflowPersistenceService:
         """
         Serialize tool input to dictionary for database storage.
         
-        Handles Pydantic models and dict types.
+        Handles Pydantic (v2) models and dict types.
         
         Args:
             tool_input: Tool input object (Pydantic model or dict)
@@ -238,18 +288,30 @@ class WorkflowPersistenceService:
         if not tool_input:
             return {}
         
-        # Try Pydantic model_dump (v2)
-        if hasattr(tool_input, 'model_dump'):
-            return tool_input.model_dump()
-        
-        # Try Pydantic dict (v1)
-        if hasattr(tool_input, 'dict'):
-            return tool_input.dict()
-        
         # Already a dict
         if isinstance(tool_input, dict):
             return tool_input
         
+        # Pydantic model (isinstance, not hasattr probes)
+        if isinstance(tool_input, BaseModel):
+            return tool_input.model_dump()
+        
         # Fallback
-        logger.warning(f"Unknown tool_input type: {type(tool_input)}")
+        logger.warning("Unknown tool_input type: %s", type(tool_input))
         return {}
+    
+    @staticmethod
+    def serialize_tool_input_json(tool_input: Optional[Dict[str, Any]]) -> bytes:
+        """
+        Serialize validated tool input straight to JSON bytes for a JSONB column.
+        
+        The validator always produces a plain dict, which orjson encodes
+        directly; the bytes pass through the engine's JSON serializer as-is.
+        
+        Args:
+            tool_input: Validated tool input dict
+            
+        Returns:
+            UTF-8 JSON document
+        """
+        return orjson.dumps(tool_input) if tool_input else b"{}"
@@ -2,17 +2,21 @@
 Workflow Utils Package - Helper utilities for workflow operations.
 """
 from .state_manager import (
+    WorkflowState,
     create_initial_state,
     add_processing_step,
     add_error,
-    serialize_tool_input
+    serialize_tool_input,
+    serialize_tool_input_json
 )
 from .node_persistence import NodePersistence
 
 __all__ = [
+    "WorkflowState",
     "create_initial_state",
     "add_processing_step",
     "add_error",
     "serialize_tool_input",
+    "serialize_tool_input_json",
     "NodePersistence"
 ]
@@ -1,17 +1,59 @@
 """
 State Manager - Creates and manages orchestrator state.
 """
-from typing import Dict, Any, Optional, List
-from models.schemas import UserInfo
+import asyncio
+import operator
+from typing import Dict, Any, Optional, List, Annotated, TypedDict
+from uuid import UUID
+from models.schemas import UserInfo, ToolType, ExtractedParameters, ToolResponse
+from .node_persistence import NodePersistence
+
+
+class WorkflowState(TypedDict, total=False):
+    """
+    LangGraph state schema.
+    
+    Every key is its own channel, so nodes return only the keys they
+    change and LangGraph merges them. processing_steps and errors are
+    appended to (operator.add) rather than replaced.
+    """
+    # Input
+    user_message: str
+    user_info: UserInfo
+    chat_history: List[Dict[str, str]]
+    history_task: Optional["asyncio.Task[List[Dict[str, str]]]"]
+    conversation_id: UUID
+    db_session: Optional[Any]
+    persistence: NodePersistence
+    
+    # Workflow state
+    intent: Optional[ToolType]
+    prompt_context: Optional[Any]
+    speculative_intent: Optional[ToolType]
+    speculative_extraction: Optional["asyncio.Task[ExtractedParameters]"]
+    extracted_params: Optional[ExtractedParameters]
+    validation_passed: bool
+    tool_input: Optional[Any]
+    tool_response: Optional[ToolResponse]
+    
+    # Output
+    final_message: Optional[str]
+    needs_clarification: bool
+    clarification_question: Optional[str]
+    
+    # Metadata
+    processing_steps: Annotated[List[str], operator.add]
+    errors: Annotated[List[str], operator.add]
 
 
 def create_initial_state(
     user_message: str,
     user_info: UserInfo,
     chat_history: List[Dict[str, str]],
-    conversation_id: str,
-    db_session: Optional[Any] = None
-) -> Dict[str, Any]:
+    conversation_id: UUID,
+    db_session: Optional[Any] = None,
+    history_task: Optional["asyncio.Task[List[Dict[str, str]]]"] = None
+) -> WorkflowState:
     """
     Create initial state for LangGraph workflow.
     
@@ -21,6 +63,8 @@ def create_initial_state(
         chat_history: Conversation history
         conversation_id: Conversation ID
         db_session: Optional database session
+        history_task: Pending load of stored history, awaited by the first
+            node that needs it (replaces chat_history once resolved)
         
     Returns:
         Initial state dictionary
@@ -30,11 +74,16 @@ def create_initial_state(
         "user_message": user_message,
         "user_info": user_info,
         "chat_history": chat_history,
+        "history_task": history_task,
         "conversation_id": conversation_id,
         "db_session": db_session,
+        "persistence": NodePersistence(db_session),
         
         # Workflow state
         "intent": None,
+        "prompt_context": None,
+        "speculative_intent": None,
+        "speculative_extraction": None,
         "extracted_params": None,
         "validation_passed": False,
         "tool_input": None,
@@ -51,53 +100,29 @@ def create_initial_state(
     }
 
 
-def add_processing_step(state: Dict[str, Any], step: str) -> None:
+def add_processing_step(update: WorkflowState, step: str) -> None:
     """
-    Add a processing step to state.
+    Add a processing step to a node's state update.
     
     Args:
-        state: Current state
+        update: State update the node will return
         step: Step description
     """
-    state["processing_steps"].append(step)
+    update.setdefault("processing_steps", []).append(step)
 
 
-def add_error(state: Dict[str, Any], error: str) -> None:
+def add_error(update: WorkflowState, error: str) -> None:
     """
-    Add an error to state.
+    Add an error to a node's state update.
     
     Args:
-        state: Current state
+        update: State update the node will return
         error: Error description
     """
-    state["errors"].append(error)
+    update.setdefault("errors", []).append(error)
 
 
-def serialize_tool_input(tool_input: Any) -> Dict[str, Any]:
-    """
-    Serialize tool input to dictionary.
-    
-    Handles Pydantic models (v1 and v2) and dicts.
-    
-    Args:
-        tool_input: Tool input object
-        
-    Returns:
-        Dictionary representation
-    """
-    if not tool_input:
-        return {}
-    
-    # Pydantic v2
-    if hasattr(tool_input, 'model_dump'):
-        return tool_input.model_dump()
-    
-    # Pydantic v1
-    if hasattr(tool_input, 'dict'):
-        return tool_input.dict()
-    
-    # Already a dict
-    if isinstance(tool_input, dict):
-        return tool_input
-    
-    return {}
+# Serialize tool input to a dictionary / JSON bytes (shared with the
+# persistence service)
+serialize_tool_input = NodePersistence.serialize_tool_input
+serialize_tool_input_json = NodePersistence.serialize_tool_input_json
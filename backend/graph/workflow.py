@@ -5,9 +5,10 @@ This file defines the workflow structure (nodes and edges) but delegates
 actual processing to modular node handlers in graph/nodes/.
 """
 import logging
-from typing import Dict, Any
+from typing import Any, Optional
 from langgraph.graph import StateGraph, END
 
+from graph.utils.state_manager import WorkflowState
 from graph.nodes import (
     intent_classification_node,
     parameter_extraction_node,
@@ -18,12 +19,15 @@ from graph.nodes import (
 
 logger = logging.getLogger(__name__)
 
+# Compiled graph shared by all requests (the graph is immutable once compiled)
+_app: Optional[Any] = None
+
 
 # ============================================================================
 # ROUTING LOGIC
 # ============================================================================
 
-def should_clarify(state: Dict[str, Any]) -> str:
+def should_clarify(state: WorkflowState) -> str:
     """
     Routing function: decide if we need clarification or can execute tool.
     
@@ -31,12 +35,9 @@ def should_clarify(state: Dict[str, Any]) -> str:
         state: Current workflow state
         
     Returns:
-        'execute' if validation passed, 'clarify' if validation failed
+        Next node: 'execute_tool' if validation passed, 'clarify' if it failed
     """
-    if state["validation_passed"]:
-        return "execute"
-    else:
-        return "clarify"
+    return "execute_tool" if state["validation_passed"] else "clarify"
 
 
 # ============================================================================
@@ -61,7 +62,7 @@ def create_orchestrator_graph() -> StateGraph:
     logger.info("Creating orchestrator graph")
     
     # Create graph
-    workflow = StateGraph(dict)
+    workflow = StateGraph(WorkflowState)
     
     # Add nodes (imported from graph/nodes/)
     workflow.add_node("classify_intent", intent_classification_node)
@@ -75,14 +76,11 @@ def create_orchestrator_graph() -> StateGraph:
     workflow.add_edge("classify_intent", "extract_parameters")
     workflow.add_edge("extract_parameters", "validate")
     
-    # Conditional routing after validation
+    # Conditional routing after validation (should_clarify returns the node name)
     workflow.add_conditional_edges(
         "validate",
         should_clarify,
-        {
-            "execute": "execute_tool",
-            "clarify": "clarify"
-        }
+        ["execute_tool", "clarify"]
     )
     
     # End nodes
@@ -96,5 +94,27 @@ def create_orchestrator_graph() -> StateGraph:
     return app
 
 
+def get_app() -> Any:
+    """
+    Get the shared compiled workflow, building it on first use.
+    
+    Compilation is synchronous, so concurrent requests can't interleave
+    while it runs and no lock is needed.
+    
+    Returns:
+        Process-wide compiled LangGraph application
+    """
+    global _app
+    if _app is None:
+        _app = create_orchestrator_graph()
+    return _app
+
+
+def reset_app() -> None:
+    """Drop the shared compiled workflow so the next get_app() rebuilds it (tests)."""
+    global _app
+    _app = None
+
+
 # Export
-__all__ = ["create_orchestrator_graph", "should_clarify"]
+__all__ = ["create_orchestrator_graph", "get_app", "reset_app", "should_clarify"]
@@ -43,10 +43,23 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Database initialization error: {e}")
     
+    # Warm up the shared tool-service HTTP client
+    from agents.tool_executor import get_client, close_client
+    get_client()
+    
+    # Open the Gemini connection so the first turn skips the handshake
+    from services.gemini_service import gemini_service
+    await gemini_service.warmup()
+    
+    # Compile the workflow graph before the first request
+    from graph.workflow import get_app
+    get_app()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down AI Tutor Orchestrator...")
+    await close_client()
 
 
 # Create FastAPI app
@@ -95,12 +108,14 @@ async def global_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
     
     uvicorn.run(
         "main:app",
         host=os.getenv("APP_HOST", "0.0.0.0"),
         port=int(os.getenv("APP_PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop is not available on Windows
         reload=os.getenv("DEBUG", "true").lower() == "true",
         log_level=os.getenv("LOG_LEVEL", "INFO").lower()
     )
@@ -5,6 +5,7 @@ Defines schemas for all educational tools and student data.
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Literal, Dict, Any
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 
@@ -181,7 +182,7 @@ class ChatRequest(BaseModel):
     """Request to chat endpoint."""
     message: str = Field(..., description="User's message")
     user_info: UserInfo
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[UUID] = None
     chat_history: List[ChatMessage] = []
 
 
@@ -198,7 +199,7 @@ class ToolResponse(BaseModel):
 
 class ChatResponse(BaseModel):
     """Response from chat endpoint."""
-    conversation_id: str
+    conversation_id: UUID
     message: str
     tool_response: Optional[ToolResponse] = None
     extracted_parameters: Optional[ExtractedParameters] = None
@@ -216,7 +217,7 @@ class OrchestratorState(BaseModel):
     user_message: str
     user_info: UserInfo
     chat_history: List[ChatMessage]
-    conversation_id: str
+    conversation_id: UUID
     
     # Processing
     intent: Optional[ToolType] = None
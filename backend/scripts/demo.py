@@ -31,6 +31,7 @@ for logger_name in ['sqlalchemy', 'sqlalchemy.engine', 'sqlalchemy.pool',
 import asyncio
 from datetime import datetime
 import uuid
+from uuid6 import uuid7
 import time
 from typing import Optional
 
@@ -47,6 +48,7 @@ from database.repositories import (
 )
 from models.schemas import UserInfo, ChatMessage, TeachingStyle
 from graph.orchestrator import orchestrate
+from utils.educational_logger import edu_logger
 
 
 # ============================================================================
@@ -389,7 +391,7 @@ async def create_user(db, user_info: UserInfo):
     
     user_repo = UserRepository(db)
     user, created = await user_repo.get_or_create(
-        user_id=user_info.user_id,
+        user_id=uuid.UUID(user_info.user_id),
         name=user_info.name,
         grade_level=user_info.grade_level,
         learning_style_summary=user_info.learning_style_summary,
@@ -414,21 +416,21 @@ async def create_user(db, user_info: UserInfo):
 
 async def start_conversation(db, user_id: str):
     """Start new conversation."""
-    conversation_id = str(uuid.uuid4())
+    conversation_id = uuid7()
     
     conv_repo = ConversationRepository(db)
     conversation = await conv_repo.create(
         conversation_id=conversation_id,
-        user_id=user_id
+        user_id=uuid.UUID(user_id)
     )
     await db.commit()
     
-    print_info(f"📝 New conversation started (ID: {conversation_id[:8]}...)")
+    print_info(f"📝 New conversation started (ID: {str(conversation_id)[:8]}...)")
     
     return conversation_id
 
 
-async def process_message(message: str, conversation_id: str, chat_history: list, user_info: UserInfo, db):
+async def process_message(message: str, conversation_id: uuid.UUID, chat_history: list, user_info: UserInfo, db):
     """Process user message through orchestrator."""
     print_user_message(message)
     
@@ -461,6 +463,9 @@ async def process_message(message: str, conversation_id: str, chat_history: list
     # Stop spinner
     spinner.stop()
     
+    # Let the queued workflow trace finish before printing the results
+    edu_logger.flush()
+    
     # Show results
     print(f"{Color.BRIGHT_GREEN}✨ Processing Complete{Color.RESET} {Color.DIM}({duration:.2f}s){Color.RESET}\n")
     
@@ -513,38 +518,33 @@ async def process_message(message: str, conversation_id: str, chat_history: list
     return result
 
 
-async def show_conversation_stats(conversation_id: str, db):
+async def show_conversation_stats(conversation_id: uuid.UUID, db):
     """Show conversation statistics."""
     print_section("Conversation Statistics", "📊")
     
     from sqlalchemy import select, func
-    from database.models import ChatMessage, ToolExecution
-    from uuid import UUID
-    
-    conv_uuid = UUID(conversation_id) if isinstance(conversation_id, str) else conversation_id
+    from database.models import ChatMessage
     
     # Get message count
     message_count_result = await db.execute(
-        select(func.count()).select_from(ChatMessage).where(ChatMessage.conversation_id == conv_uuid)
+        select(func.count()).select_from(ChatMessage).where(ChatMessage.conversation_id == conversation_id)
     )
     message_count = message_count_result.scalar()
     
-    # Get tool executions
-    tools_result = await db.execute(
-        select(ToolExecution).where(ToolExecution.conversation_id == conv_uuid)
-    )
-    tools = list(tools_result.scalars().all())
+    # Get tool execution aggregates (computed server-side, one row per tool)
+    tool_stats = await ToolExecutionRepository(db).get_stats_by_tool(conversation_id)
+    tools_executed = sum(s["total"] for s in tool_stats)
     
     # Prepare data
     stats = {
         "Total Messages": message_count,
-        "Tools Executed": len(tools),
-        "Successful Tools": sum(1 for t in tools if t.success),
-        "Database Records Saved": message_count + len(tools) + 1,
+        "Tools Executed": tools_executed,
+        "Successful Tools": sum(s["successful"] for s in tool_stats),
+        "Database Records Saved": message_count + tools_executed + 1,
     }
     
-    if tools:
-        avg_time = sum(t.execution_time_ms for t in tools if t.execution_time_ms) / len(tools)
+    if tools_executed:
+        avg_time = sum(s["total_execution_time_ms"] or 0 for s in tool_stats) / tools_executed
         stats["Avg Tool Execution"] = f"{avg_time:.0f}ms"
     
     print_analytics_box("Session Analytics", stats)
@@ -554,23 +554,40 @@ async def show_database_summary(db):
     """Show overall database statistics."""
     print_section("Database Summary", "💾")
     
-    from sqlalchemy import select, func
+    from sqlalchemy import select, func, literal
     from database.models import User, Conversation, ChatMessage, ToolExecution, ParameterExtraction
     
-    # Get counts
-    user_count = await db.scalar(select(func.count()).select_from(User))
-    conv_count = await db.scalar(select(func.count()).select_from(Conversation))
-    msg_count = await db.scalar(select(func.count()).select_from(ChatMessage))
-    tool_count = await db.scalar(select(func.count()).select_from(ToolExecution))
-    extraction_count = await db.scalar(select(func.count()).select_from(ParameterExtraction))
-    
-    # Average confidence
-    avg_confidence = await db.scalar(select(func.avg(ParameterExtraction.confidence_score)))
-    
-    # Success rate
-    successful_tools = await db.scalar(
-        select(func.count()).select_from(ToolExecution).where(ToolExecution.success == True)
+    # Get all counts in a single round-trip (one scalar subquery per table,
+    # FILTER/avg aggregates fused into the same scan)
+    tool_stats = select(
+        func.count().label("total"),
+        func.count().filter(ToolExecution.success.is_(True)).label("successful"),
+    ).subquery()
+    extraction_stats = select(
+        func.count().label("total"),
+        func.avg(ParameterExtraction.confidence_score).label("avg_confidence"),
+    ).subquery()
+    result = await db.execute(
+        select(
+            select(func.count()).select_from(User).scalar_subquery(),
+            select(func.count()).select_from(Conversation).scalar_subquery(),
+            select(func.count()).select_from(ChatMessage).scalar_subquery(),
+            tool_stats.c.total,
+            tool_stats.c.successful,
+            extraction_stats.c.total,
+            extraction_stats.c.avg_confidence,
+        ).select_from(tool_stats.join(extraction_stats, literal(True)))
     )
+    (
+        user_count,
+        conv_count,
+        msg_count,
+        tool_count,
+        successful_tools,
+        extraction_count,
+        avg_confidence,
+    ) = result.one()
+    
     success_rate = (successful_tools / tool_count * 100) if tool_count > 0 else 0
     
     db_stats = {
@@ -668,8 +685,15 @@ async def interactive_demo():
 # ============================================================================
 
 if __name__ == "__main__":
+    # Same event loop as the API server (uvloop is not available on Windows)
+    if sys.platform == "win32":
+        run = asyncio.run
+    else:
+        import uvloop
+        run = uvloop.run
+    
     try:
-        asyncio.run(interactive_demo())
+        run(interactive_demo())
     except KeyboardInterrupt:
         print(f"\n\n{Color.BRIGHT_YELLOW}Demo interrupted. Goodbye!{Color.RESET}\n")
     except Exception as e:
@@ -15,7 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from database.database import init_db, check_db_connection, engine
+from database.database import init_db, apply_indexes, check_db_connection, engine
 from database.models import Base
 
 logging.basicConfig(
@@ -69,6 +69,16 @@ async def initialize_database():
         print(f"❌ Error creating tables: {e}")
         return False
     
+    # Indexes are built CONCURRENTLY here, not on app startup
+    print("Building indexes...")
+    try:
+        await apply_indexes()
+        print("✅ Indexes up to date!")
+        print()
+    except Exception as e:
+        print(f"❌ Error building indexes: {e}")
+        return False
+    
     # Step 3: Verify tables
     print("Step 3: Verifying table creation...")
     try:
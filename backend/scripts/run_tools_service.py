@@ -3,10 +3,11 @@ Educational Tools Service with AI-generated content.
 Uses Google Gemini to generate real educational content.
 """
 import logging
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Type, TypeVar
 import sys
 import os
 import json
@@ -53,15 +54,32 @@ app.add_middleware(
 )
 
 
+InputModel = TypeVar("InputModel", bound=BaseModel)
+
+
+async def parse_tool_input(request: Request, model: Type[InputModel]) -> InputModel:
+    """
+    Validate the raw JSON body straight from bytes.
+    
+    model_validate_json runs the model's core validator (built once at
+    import) in a single pass, skipping the intermediate dict FastAPI builds.
+    """
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
 # ============================================================================
 # NOTE MAKER TOOL
 # ============================================================================
 
 @app.post("/api/note-maker", response_model=NoteMakerOutput)
-async def note_maker_tool(input_data: NoteMakerInput) -> NoteMakerOutput:
+async def note_maker_tool(request: Request) -> NoteMakerOutput:
     """
     Generate AI-powered study notes based on topic and student preferences.
     """
+    input_data = await parse_tool_input(request, NoteMakerInput)
     logger.info(f"Note Maker: topic={input_data.topic}, style={input_data.note_taking_style}")
     
     try:
@@ -166,10 +184,11 @@ Return ONLY the JSON, no markdown."""
 # ============================================================================
 
 @app.post("/api/flashcard-generator", response_model=FlashcardGeneratorOutput)
-async def flashcard_generator_tool(input_data: FlashcardGeneratorInput) -> FlashcardGeneratorOutput:
+async def flashcard_generator_tool(request: Request) -> FlashcardGeneratorOutput:
     """
     Generate flashcards for practice and memorization using Gemini AI.
     """
+    input_data = await parse_tool_input(request, FlashcardGeneratorInput)
     logger.info(f"Flashcard Generator: topic={input_data.topic}, count={input_data.count}, difficulty={input_data.difficulty}")
     
     try:
@@ -277,10 +296,11 @@ Return ONLY the JSON array, no markdown formatting."""
 # ============================================================================
 
 @app.post("/api/concept-explainer", response_model=ConceptExplainerOutput)
-async def concept_explainer_tool(input_data: ConceptExplainerInput) -> ConceptExplainerOutput:
+async def concept_explainer_tool(request: Request) -> ConceptExplainerOutput:
     """
     AI-powered concept explainer with adaptive depth and examples.
     """
+    input_data = await parse_tool_input(request, ConceptExplainerInput)
     logger.info(f"Concept Explainer: concept={input_data.concept_to_explain}, depth={input_data.desired_depth}")
     
     try:
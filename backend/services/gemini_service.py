@@ -3,9 +3,10 @@ Gemini AI service for intelligent parameter extraction and content generation.
 Handles all interactions with Google's Gemini API.
 """
 import os
-import json
+import orjson
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, NamedTuple, Optional, Union
 from google import generativeai as genai
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
@@ -20,9 +21,84 @@ from models.schemas import (
     TeachingStyle,
     EmotionalState
 )
+from utils.ttl_cache import TTLCache, cache_key
 
 logger = logging.getLogger(__name__)
 
+# Results below this confidence (including error fallbacks) are not cached
+_CACHE_MIN_CONFIDENCE = 0.7
+
+# Exact-match caches of Gemini results for repeated inputs. Each key covers
+# every prompt input (normalized message, profile, history); per-user
+# results are also scoped by user id.
+_LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "600"))
+_intent_cache: TTLCache[ToolType] = TTLCache(maxsize=10_000, ttl=_LLM_CACHE_TTL_SECONDS)
+_extraction_cache: TTLCache[ExtractedParameters] = TTLCache(maxsize=10_000, ttl=_LLM_CACHE_TTL_SECONDS)
+_clarification_cache: TTLCache[str] = TTLCache(maxsize=10_000, ttl=_LLM_CACHE_TTL_SECONDS)
+# Upper bound on the startup warmup call so a slow network never delays boot
+_WARMUP_TIMEOUT_SECONDS = float(os.getenv("GEMINI_WARMUP_TIMEOUT_SECONDS", "5"))
+# In-flight classifications, so concurrent identical turns share one call
+_intent_inflight: Dict[str, "asyncio.Task[ToolType]"] = {}
+
+
+def normalize_message(message: str) -> str:
+    """Case- and whitespace-insensitive form of a message, for cache keys."""
+    return " ".join(message.lower().split())
+
+
+def format_history(
+    chat_history: List[Union[ChatMessage, Dict[str, str]]],
+    limit: int
+) -> str:
+    """
+    Render the last `limit` messages as "role: content" lines for a prompt.
+    
+    Accepts ChatMessage models (history sent with the request) and
+    {"role", "content"} dicts (history loaded from the database).
+    """
+    lines = []
+    for msg in chat_history[-limit:]:
+        if isinstance(msg, dict):
+            role, content = msg["role"], msg["content"]
+        else:
+            role, content = msg.role, msg.content
+        lines.append(f"{role if isinstance(role, str) else role.value}: {content}")
+    return "\n".join(lines)
+
+
+class PromptContext(NamedTuple):
+    """Per-turn prompt inputs, built once and shared by every Gemini call."""
+    message_key: str  # normalize_message(message), for cache keys
+    recent_history: str  # Last 5 messages (classification)
+    history: str  # Last 10 messages (extraction)
+
+
+def build_prompt_context(
+    message: str,
+    chat_history: List[Union[ChatMessage, Dict[str, str]]]
+) -> PromptContext:
+    """Build the turn's PromptContext."""
+    return PromptContext(
+        message_key=normalize_message(message),
+        recent_history=format_history(chat_history, 5),
+        history=format_history(chat_history, 10)
+    )
+
+
+def guess_intent(message: str) -> ToolType:
+    """
+    Guess the tool from keywords in the message (no LLM call).
+    
+    Used as the fallback when classification returns an unknown tool, and
+    to pick which extraction to start speculatively.
+    """
+    text = message.lower()
+    if any(word in text for word in ["note", "summary", "study guide"]):
+        return ToolType.NOTE_MAKER
+    if any(word in text for word in ["flashcard", "question", "quiz", "practice"]):
+        return ToolType.FLASHCARD_GENERATOR
+    return ToolType.CONCEPT_EXPLAINER
+
 
 def clean_json_response(text: str) -> str:
     """Clean JSON response from Gemini, removing markdown code blocks."""
@@ -63,13 +139,76 @@ class GeminiService:
         # Direct Gemini model for function calling
         self.model = genai.GenerativeModel(model_name)
         
-        logger.info(f"Gemini service initialized with model: {model_name}")
+        logger.info("Gemini service initialized with model: %s", model_name)
+    
+    def _ensure_async_client(self):
+        """
+        Return the LangChain model's async gRPC client, building it if needed.
+        
+        The client is only created when the model is constructed inside a
+        running event loop, which is not the case for this module-level
+        instance. Returns None if it cannot be built.
+        """
+        client = getattr(self.llm, "async_client", None)
+        if client is not None:
+            return client
+        try:
+            from langchain_google_genai import _genai_extension as genaix
+            client = genaix.build_generative_async_service(
+                credentials=self.llm.credentials,
+                api_key=self.llm.google_api_key.get_secret_value(),
+                client_info=None,
+                client_options=self.llm.client_options,
+                transport="grpc_asyncio"
+            )
+            # Newer releases cache the client behind a read-only property
+            attr = "async_client_running" if hasattr(self.llm, "async_client_running") else "async_client"
+            setattr(self.llm, attr, client)
+            return client
+        except Exception as e:
+            logger.info("Could not build Gemini async client: %s", e)
+            return None
+    
+    async def warmup(self, timeout: float = _WARMUP_TIMEOUT_SECONDS) -> None:
+        """
+        Open the connection ainvoke() uses before the first request.
+        
+        Sends a token-count request (free, no generation) on the LangChain
+        model's async gRPC client so the first turn skips the TLS handshake.
+        Without an async client ainvoke() falls back to the sync client in
+        a thread, so that one is warmed instead. Bounded by ``timeout``;
+        failures are logged and ignored.
+        """
+        client = self._ensure_async_client()
+        try:
+            if client is not None:
+                from google.ai.generativelanguage_v1beta.types import (
+                    Content,
+                    CountTokensRequest,
+                    Part
+                )
+                call = client.count_tokens(
+                    request=CountTokensRequest(
+                        model=self.llm.model,
+                        contents=[Content(parts=[Part(text="ping")])]
+                    )
+                )
+            else:
+                logger.info("Gemini async client unavailable; warming the sync client")
+                call = asyncio.to_thread(self.llm.get_num_tokens, "ping")
+            await asyncio.wait_for(call, timeout=timeout)
+            logger.info("Gemini connection warmed up")
+        except asyncio.TimeoutError:
+            logger.warning("Gemini warmup skipped: no response within %.1fs", timeout)
+        except Exception as e:
+            logger.warning("Gemini warmup skipped: %s", e)
     
     async def classify_intent(
         self, 
         message: str, 
         chat_history: List[ChatMessage],
-        user_info: UserInfo
+        user_info: UserInfo,
+        context: Optional[PromptContext] = None
     ) -> ToolType:
         """
         Classify user intent to determine which educational tool to use.
@@ -78,14 +217,27 @@ class GeminiService:
             message: Current user message
             chat_history: Previous conversation messages
             user_info: Student profile information
+            context: Prompt inputs already built for this turn
             
         Returns:
             ToolType enum indicating which tool to use
         """
-        history_text = "\n".join([
-            f"{msg.role if isinstance(msg.role, str) else msg.role.value}: {msg.content}" 
-            for msg in chat_history[-5:]  # Last 5 messages for context
-        ])
+        if context is None:
+            context = build_prompt_context(message, chat_history)
+        history_text = context.recent_history
+        
+        key = cache_key(
+            user_info.user_id,
+            context.message_key,
+            history_text,
+            user_info.grade_level,
+            user_info.mastery_level_summary,
+            user_info.emotional_state_summary
+        )
+        cached = _intent_cache.get(key)
+        if cached is not None:
+            logger.info("Intent cache hit: %s", cached.value)
+            return cached
         
         prompt = f"""You are an expert educational assistant. Analyze the student's message and determine which educational tool they need.
 
@@ -113,6 +265,19 @@ Classification Rules:
 Return ONLY the tool name (note_maker, flashcard_generator, or concept_explainer).
 """
         
+        task = _intent_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._classify(key, prompt, message))
+            _intent_inflight[key] = task
+            task.add_done_callback(lambda _: _intent_inflight.pop(key, None))
+        else:
+            logger.info("Joining in-flight intent classification")
+        
+        # Shielded so one caller cancelling doesn't cancel the shared call
+        return await asyncio.shield(task)
+    
+    async def _classify(self, key: str, prompt: str, message: str) -> ToolType:
+        """Run the classification prompt and cache a clean answer."""
         try:
             response = await self.llm.ainvoke(prompt)
             tool_name = response.content.strip().lower()
@@ -125,20 +290,18 @@ Return ONLY the tool name (note_maker, flashcard_generator, or concept_explainer
             }
             
             tool = tool_mapping.get(tool_name)
-            if not tool:
+            if tool:
+                # Only clean answers are cached, not keyword fallbacks
+                _intent_cache.set(key, tool)
+            else:
                 # Default fallback based on keywords
-                if any(word in message.lower() for word in ["note", "summary", "study guide"]):
-                    tool = ToolType.NOTE_MAKER
-                elif any(word in message.lower() for word in ["flashcard", "question", "quiz", "practice"]):
-                    tool = ToolType.FLASHCARD_GENERATOR
-                else:
-                    tool = ToolType.CONCEPT_EXPLAINER
+                tool = guess_intent(message)
             
-            logger.info(f"Intent classified as: {tool.value}")
+            logger.info("Intent classified as: %s", tool.value)
             return tool
             
         except Exception as e:
-            logger.error(f"Error in intent classification: {e}")
+            logger.error("Error in intent classification: %s", e)
             # Default to concept explainer as safest option
             return ToolType.CONCEPT_EXPLAINER
     
@@ -147,7 +310,8 @@ Return ONLY the tool name (note_maker, flashcard_generator, or concept_explainer
         message: str,
         chat_history: List[ChatMessage],
         user_info: UserInfo,
-        tool_type: ToolType
+        tool_type: ToolType,
+        context: Optional[PromptContext] = None
     ) -> ExtractedParameters:
         """
         Extract parameters required for the identified tool from conversation.
@@ -163,31 +327,51 @@ Return ONLY the tool name (note_maker, flashcard_generator, or concept_explainer
             chat_history: Previous conversation
             user_info: Student profile
             tool_type: Which tool we're extracting for
+            context: Prompt inputs already built for this turn
             
         Returns:
             ExtractedParameters with all params and metadata
         """
-        logger.info(f"Extracting parameters for {tool_type.value}")
+        logger.info("Extracting parameters for %s", tool_type.value)
         
         # Build conversation context
-        history_text = "\n".join([
-            f"{msg.role if isinstance(msg.role, str) else msg.role.value}: {msg.content}" 
-            for msg in chat_history[-10:]
-        ])
+        if context is None:
+            context = build_prompt_context(message, chat_history)
+        history_text = context.history
+        
+        key = cache_key(
+            user_info.user_id,
+            tool_type.value,
+            context.message_key,
+            history_text,
+            user_info.grade_level,
+            user_info.mastery_level_summary,
+            user_info.learning_style_summary,
+            user_info.emotional_state_summary
+        )
+        cached = _extraction_cache.get(key)
+        if cached is not None:
+            logger.info("Extraction cache hit for %s", tool_type.value)
+            # Copy: downstream nodes update missing_required in place
+            return cached.model_copy(deep=True)
         
         # Tool-specific extraction
         if tool_type == ToolType.NOTE_MAKER:
-            return await self._extract_note_maker_params(
+            extracted = await self._extract_note_maker_params(
                 message, history_text, user_info
             )
         elif tool_type == ToolType.FLASHCARD_GENERATOR:
-            return await self._extract_flashcard_params(
+            extracted = await self._extract_flashcard_params(
                 message, history_text, user_info
             )
         else:  # CONCEPT_EXPLAINER
-            return await self._extract_concept_explainer_params(
+            extracted = await self._extract_concept_explainer_params(
                 message, history_text, user_info
             )
+        
+        if extracted.confidence >= _CACHE_MIN_CONFIDENCE:
+            _extraction_cache.set(key, extracted.model_copy(deep=True))
+        return extracted
     
     async def _extract_note_maker_params(
         self,
@@ -243,7 +427,7 @@ Return ONLY valid JSON, no explanation.
         
         try:
             response = await self.llm.ainvoke(prompt)
-            result = json.loads(clean_json_response(response.content))
+            result = orjson.loads(clean_json_response(response.content))
             
             # Build ExtractedParameters
             inferred_params = {
@@ -266,7 +450,7 @@ Return ONLY valid JSON, no explanation.
             )
             
         except Exception as e:
-            logger.error(f"Error extracting note maker params: {e}")
+            logger.error("Error extracting note maker params: %s", e)
             # Fallback extraction
             return ExtractedParameters(
                 tool_type=ToolType.NOTE_MAKER,
@@ -340,7 +524,7 @@ Return ONLY valid JSON, no explanation.
         
         try:
             response = await self.llm.ainvoke(prompt)
-            result = json.loads(clean_json_response(response.content))
+            result = orjson.loads(clean_json_response(response.content))
             
             # Validate count
             count = result.get("count", 5)
@@ -367,7 +551,7 @@ Return ONLY valid JSON, no explanation.
             )
             
         except Exception as e:
-            logger.error(f"Error extracting flashcard params: {e}")
+            logger.error("Error extracting flashcard params: %s", e)
             return ExtractedParameters(
                 tool_type=ToolType.FLASHCARD_GENERATOR,
                 parameters={
@@ -432,7 +616,7 @@ Return ONLY valid JSON, no explanation.
         
         try:
             response = await self.llm.ainvoke(prompt)
-            result = json.loads(clean_json_response(response.content))
+            result = orjson.loads(clean_json_response(response.content))
             
             inferred_params = {
                 param: str(result.get(param, "N/A")) 
@@ -454,7 +638,7 @@ Return ONLY valid JSON, no explanation.
             )
             
         except Exception as e:
-            logger.error(f"Error extracting concept explainer params: {e}")
+            logger.error("Error extracting concept explainer params: %s", e)
             return ExtractedParameters(
                 tool_type=ToolType.CONCEPT_EXPLAINER,
                 parameters={
@@ -488,6 +672,11 @@ Return ONLY valid JSON, no explanation.
         if isinstance(tool_type, str):
             tool_type = ToolType(tool_type)
             
+        key = cache_key(sorted(missing_params), tool_type.value, normalize_message(context))
+        cached = _clarification_cache.get(key)
+        if cached is not None:
+            return cached
+        
         param_str = ", ".join(missing_params)
         
         prompt = f"""Generate a natural, friendly clarification question.
@@ -509,9 +698,11 @@ Return ONLY the question, no explanation.
         
         try:
             response = await self.llm.ainvoke(prompt)
-            return response.content.strip()
+            question = response.content.strip()
+            _clarification_cache.set(key, question)
+            return question
         except Exception as e:
-            logger.error(f"Error generating clarification: {e}")
+            logger.error("Error generating clarification: %s", e)
             # Simple fallback
             if "topic" in missing_params:
                 return "What topic would you like to learn about?"
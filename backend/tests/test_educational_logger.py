@@ -0,0 +1,49 @@
+"""Tests for the educational logger's output thread."""
+import pytest
+
+from utils import educational_logger
+from utils.educational_logger import EducationalLogger, edu_logger
+
+
+@pytest.fixture(autouse=True)
+def fresh_listener():
+    """Each test starts (and ends) without a running listener thread."""
+    educational_logger._stop_listener()
+    yield
+    educational_logger._stop_listener()
+
+
+def test_disabled_logger_starts_no_thread(monkeypatch):
+    monkeypatch.setattr(EducationalLogger, "enabled", False)
+    
+    edu_logger.emit("hidden")
+    edu_logger.log_result("hidden")
+    
+    assert educational_logger._listener is None
+
+
+def test_first_record_starts_listener(monkeypatch):
+    monkeypatch.setattr(EducationalLogger, "enabled", True)
+    
+    edu_logger.emit("shown")
+    listener = educational_logger._listener
+    
+    assert listener is not None
+    edu_logger.emit("shown again")
+    assert educational_logger._listener is listener
+
+
+def test_flush_waits_for_queued_output(monkeypatch, capsys):
+    monkeypatch.setattr(EducationalLogger, "enabled", True)
+    
+    for i in range(100):
+        edu_logger.emit(f"line {i}")
+    edu_logger.flush()
+    
+    assert capsys.readouterr().out.splitlines()[-1] == "line 99"
+
+
+def test_flush_without_listener_returns():
+    edu_logger.flush()
+    
+    assert educational_logger._listener is None
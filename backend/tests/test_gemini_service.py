@@ -0,0 +1,62 @@
+"""Tests for the prompt helpers in services.gemini_service."""
+import asyncio
+import time
+
+import pytest
+
+from models.schemas import ChatMessage
+from services.gemini_service import build_prompt_context, format_history, gemini_service
+
+
+def test_format_history_accepts_models_and_dicts():
+    history = [
+        ChatMessage(role="user", content="What is osmosis?"),
+        {"role": "assistant", "content": "Osmosis is..."},
+    ]
+    
+    assert format_history(history, 10) == "user: What is osmosis?\nassistant: Osmosis is..."
+
+
+def test_format_history_keeps_last_messages():
+    history = [{"role": "user", "content": str(i)} for i in range(12)]
+    
+    assert format_history(history, 5).splitlines() == [f"user: {i}" for i in range(7, 12)]
+
+
+def test_build_prompt_context_from_database_history():
+    history = [{"role": "user", "content": str(i)} for i in range(12)]
+    
+    context = build_prompt_context("  Explain   Photosynthesis ", history)
+    
+    assert context.message_key == "explain photosynthesis"
+    assert len(context.recent_history.splitlines()) == 5
+    assert len(context.history.splitlines()) == 10
+
+
+class SlowAsyncClient:
+    async def count_tokens(self, request):
+        await asyncio.sleep(10)
+
+
+@pytest.mark.asyncio
+async def test_warmup_gives_up_after_timeout(monkeypatch):
+    monkeypatch.setattr(gemini_service, "_ensure_async_client", lambda: SlowAsyncClient())
+    
+    started = time.monotonic()
+    await gemini_service.warmup(timeout=0.05)
+    
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_uses_sync_client_without_async_client(monkeypatch):
+    calls = []
+    monkeypatch.setattr(gemini_service, "_ensure_async_client", lambda: None)
+    monkeypatch.setattr(
+        type(gemini_service.llm), "get_num_tokens",
+        lambda self, text: calls.append(text) or 1
+    )
+    
+    await gemini_service.warmup(timeout=1)
+    
+    assert calls == ["ping"]
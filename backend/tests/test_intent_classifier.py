@@ -0,0 +1,43 @@
+"""Tests for history resolution in the intent classification node."""
+import asyncio
+
+import pytest
+
+from graph.nodes.intent_classifier import _resolve_history
+
+
+@pytest.mark.asyncio
+async def test_resolve_history_awaits_database_load():
+    stored = [{"role": "user", "content": "Explain photosynthesis"}]
+    
+    async def load():
+        return stored
+    
+    update = {}
+    state = {"chat_history": [], "history_task": asyncio.ensure_future(load())}
+    
+    assert await _resolve_history(state, update) == stored
+    assert update["chat_history"] == stored
+    assert update["history_task"] is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_history_without_pending_load_uses_request_history():
+    history = [{"role": "user", "content": "hi"}]
+    update = {}
+    
+    assert await _resolve_history({"chat_history": history, "history_task": None}, update) == history
+    assert update == {}
+
+
+@pytest.mark.asyncio
+async def test_resolve_history_failed_load_continues_without_history():
+    async def load():
+        raise RuntimeError("connection reset")
+    
+    update = {}
+    state = {"chat_history": [], "history_task": asyncio.ensure_future(load())}
+    
+    assert await _resolve_history(state, update) == []
+    assert update["chat_history"] == []
+    assert "connection reset" in update["errors"][0]
@@ -0,0 +1,55 @@
+"""Tests for the small-talk shortcut in graph.orchestrator."""
+import uuid
+
+import pytest
+
+from graph import orchestrator
+from graph.orchestrator import _answer_small_talk, _small_talk_reply
+
+
+class RecordingPersistence:
+    """Persistence stub that records saved messages."""
+    
+    def __init__(self):
+        self.messages = []
+    
+    async def save_user_message(self, conversation_id, content):
+        self.messages.append(("user", conversation_id, content))
+        return True
+    
+    async def save_assistant_message(self, conversation_id, content, tool_used=None):
+        self.messages.append(("assistant", conversation_id, content))
+        return True
+
+
+@pytest.mark.parametrize("message", ["hi", "Hello there!", "  hey ", "Thanks!!", "thank you", "thx."])
+def test_small_talk_reply_matches_whole_message(message):
+    assert _small_talk_reply(message) is not None
+
+
+@pytest.mark.parametrize("message", ["ok", "okay", "yes", "hi, explain photosynthesis", "thanks, now make flashcards"])
+def test_small_talk_reply_leaves_real_turns_to_the_workflow(message):
+    assert _small_talk_reply(message) is None
+
+
+@pytest.mark.asyncio
+async def test_answer_small_talk_saves_both_messages():
+    conversation_id = uuid.uuid4()
+    persistence = RecordingPersistence()
+    state = {
+        "user_message": "hi",
+        "conversation_id": conversation_id,
+        "persistence": persistence,
+        "tool_response": None,
+        "processing_steps": [],
+    }
+    
+    final_state = await _answer_small_talk(state, orchestrator._GREETING_REPLY)
+    
+    assert final_state["final_message"] == orchestrator._GREETING_REPLY
+    assert final_state["tool_response"] is None
+    assert final_state["processing_steps"] == ["Answered small talk directly"]
+    assert persistence.messages == [
+        ("user", conversation_id, "hi"),
+        ("assistant", conversation_id, orchestrator._GREETING_REPLY),
+    ]
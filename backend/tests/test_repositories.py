@@ -0,0 +1,114 @@
+"""
+Tests for the upsert paths of the repositories.
+
+Statements are captured by a recording session and compiled for the
+PostgreSQL dialect, so these run without a database.
+"""
+import uuid
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from database.repositories import ConversationRepository, UserRepository
+
+
+class FakeResult:
+    """Result stub returning a preset row."""
+    
+    def __init__(self, row: Any):
+        self.row = row
+    
+    def one(self) -> Any:
+        return self.row
+    
+    def scalar_one_or_none(self) -> Any:
+        return self.row
+
+
+class RecordingSession:
+    """Session stub that records executed statements and returns preset rows."""
+    
+    def __init__(self, *rows: Any):
+        self.rows = list(rows)
+        self.statements: List[Any] = []
+        self.gets: List[Any] = []
+    
+    async def execute(self, statement, *args, **kwargs) -> FakeResult:
+        self.statements.append(statement)
+        return FakeResult(self.rows.pop(0))
+    
+    async def get(self, model, key, **kwargs) -> Any:
+        self.gets.append(key)
+        return SimpleNamespace(key=key)
+
+
+def compiled_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def user_fields(user_id: uuid.UUID) -> dict:
+    return {
+        "user_id": user_id,
+        "name": "Ada",
+        "grade_level": "10",
+        "learning_style_summary": "Visual learner",
+        "emotional_state_summary": "Focused",
+        "mastery_level_summary": "Level 5",
+        "teaching_style": "direct"
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("created", [True, False])
+async def test_user_get_or_create_is_one_upsert(created):
+    user_id = uuid.uuid4()
+    user = SimpleNamespace(user_id=user_id)
+    session = RecordingSession(SimpleNamespace(User=user, created=created))
+    
+    result = await UserRepository(session).get_or_create(**user_fields(user_id))
+    
+    assert result == (user, created)
+    assert len(session.statements) == 1
+    sql = compiled_sql(session.statements[0])
+    assert "ON CONFLICT (user_id) DO UPDATE SET" in sql
+    assert "updated_at = now()" in sql
+    assert "RETURNING" in sql and "(xmax = 0)" in sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("returned, created", [(uuid.uuid4(), True), (None, False)])
+async def test_conversation_ensure_exists_inserts_without_read_back(returned, created):
+    session = RecordingSession(returned)
+    
+    assert await ConversationRepository(session).ensure_exists(uuid.uuid4(), uuid.uuid4()) is created
+    assert len(session.statements) == 1
+    assert session.gets == []
+    sql = compiled_sql(session.statements[0])
+    assert "ON CONFLICT (conversation_id) DO NOTHING" in sql
+    assert "RETURNING conversations.conversation_id" in sql
+
+
+@pytest.mark.asyncio
+async def test_conversation_get_or_create_new_row_skips_read_back():
+    conversation = SimpleNamespace()
+    session = RecordingSession(conversation)
+    
+    result = await ConversationRepository(session).get_or_create(uuid.uuid4(), uuid.uuid4())
+    
+    assert result == (conversation, True)
+    assert session.gets == []
+    assert "ON CONFLICT (conversation_id) DO NOTHING" in compiled_sql(session.statements[0])
+
+
+@pytest.mark.asyncio
+async def test_conversation_get_or_create_existing_row_is_read_back():
+    conversation_id = uuid.uuid4()
+    session = RecordingSession(None)
+    
+    conversation, created = await ConversationRepository(session).get_or_create(conversation_id, uuid.uuid4())
+    
+    assert created is False
+    assert conversation.key == conversation_id
+    assert session.gets == [conversation_id]
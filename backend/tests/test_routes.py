@@ -0,0 +1,84 @@
+"""Tests for the /api/chat route."""
+import uuid
+
+from api import routes
+from models.schemas import UserInfo
+
+
+def test_chat_new_conversation_returns_generated_id(client, session, workflow_calls, user_payload):
+    response = client.post("/api/chat", json={"message": "Explain photosynthesis", "user_info": user_payload})
+    
+    assert response.status_code == 200
+    body = response.json()
+    conversation_id = uuid.UUID(body["conversation_id"])
+    assert conversation_id.version == 7
+    assert body["message"] == "Here you go!"
+    assert session.commits == 1
+    
+    # The workflow ran for the same, newly generated conversation
+    assert len(workflow_calls) == 1
+    assert workflow_calls[0]["conversation_id"] == conversation_id
+    assert workflow_calls[0]["chat_history"] == []
+
+
+def test_chat_follow_up_loads_history_from_database(client, workflow_calls, user_payload, monkeypatch):
+    conversation_id = uuid.uuid4()
+    stored = [
+        {"role": "user", "content": "Explain photosynthesis"},
+        {"role": "assistant", "content": "Photosynthesis is..."},
+    ]
+    loaded_for = []
+    
+    async def fake_load_recent_history(requested_id):
+        loaded_for.append(requested_id)
+        return stored
+    
+    monkeypatch.setattr(routes, "_load_recent_history", fake_load_recent_history)
+    
+    response = client.post("/api/chat", json={
+        "message": "Now make flashcards on it",
+        "user_info": user_payload,
+        "conversation_id": str(conversation_id)
+    })
+    
+    assert response.status_code == 200
+    assert response.json()["conversation_id"] == str(conversation_id)
+    assert loaded_for == [conversation_id]
+    assert workflow_calls[0]["chat_history"] == stored
+
+
+def test_chat_history_in_request_skips_database_load(client, workflow_calls, user_payload, monkeypatch):
+    async def fail_load(requested_id):
+        raise AssertionError("history should not be loaded")
+    
+    monkeypatch.setattr(routes, "_load_recent_history", fail_load)
+    
+    response = client.post("/api/chat", json={
+        "message": "Now make flashcards on it",
+        "user_info": user_payload,
+        "conversation_id": str(uuid.uuid4()),
+        "chat_history": [{"role": "user", "content": "Explain photosynthesis"}]
+    })
+    
+    assert response.status_code == 200
+    assert workflow_calls[0]["history_task"] is None
+    assert workflow_calls[0]["chat_history"][0].content == "Explain photosynthesis"
+
+
+def test_chat_failure_forgets_known_user(client, user_payload, monkeypatch):
+    user_info = UserInfo(**user_payload)
+    routes._known_users[user_info.user_id] = user_info
+    
+    class MissingUserConversationRepository:
+        def __init__(self, session):
+            pass
+        
+        async def ensure_exists(self, conversation_id, user_id):
+            raise RuntimeError("conversations_user_id_fkey violated")
+    
+    monkeypatch.setattr(routes, "ConversationRepository", MissingUserConversationRepository)
+    
+    response = client.post("/api/chat", json={"message": "Explain osmosis", "user_info": user_payload})
+    
+    assert response.status_code == 500
+    assert user_info.user_id not in routes._known_users
@@ -0,0 +1,58 @@
+"""Tests for utils.ttl_cache."""
+from utils import ttl_cache
+from utils.ttl_cache import TTLCache, cache_key
+
+
+def test_cache_key_ignores_dict_order():
+    assert cache_key("note_maker", {"a": 1, "b": 2}) == cache_key("note_maker", {"b": 2, "a": 1})
+    assert cache_key("note_maker", {"a": 1}) != cache_key("flashcard_generator", {"a": 1})
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache: TTLCache[str] = TTLCache(maxsize=4, ttl=10)
+    
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    
+    now[0] += 10
+    assert cache.get("k") is None
+
+
+def test_full_cache_evicts_oldest(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=10)
+    
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_full_cache_evicts_expired_first(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=10)
+    
+    cache.set("a", 1)
+    now[0] = 101.0
+    cache.set("b", 2)
+    now[0] = 105.0
+    cache.set("a", 1)  # Refreshed, but still first in insertion order
+    
+    now[0] = 112.0  # "b" has expired, "a" has not
+    cache.set("c", 3)
+    
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_cache():
+    cache: TTLCache[int] = TTLCache(maxsize=2, ttl=0)
+    cache.set("k", 1)
+    assert cache.get("k") is None
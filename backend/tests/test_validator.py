@@ -0,0 +1,61 @@
+"""Tests for agents.validator."""
+import pytest
+
+from agents.validator import validate_parameters
+from models.schemas import ToolType, UserInfo
+
+
+@pytest.fixture
+def user_info(user_payload) -> UserInfo:
+    return UserInfo(**user_payload)
+
+
+def flashcard_params(**overrides):
+    return {"topic": "Photosynthesis", "count": 5, "difficulty": "medium", "subject": "Biology", **overrides}
+
+
+def test_valid_flashcard_params_pass(user_info):
+    is_valid, tool_input, missing = validate_parameters(ToolType.FLASHCARD_GENERATOR, flashcard_params(), user_info, [])
+    
+    assert is_valid
+    assert missing == []
+    assert tool_input["count"] == 5
+    assert tool_input["user_info"]["user_id"] == user_info.user_id
+
+
+@pytest.mark.parametrize("count", ["five", 50, 0, 2.5])
+def test_invalid_count_asks_for_count(user_info, count):
+    assert validate_parameters(ToolType.FLASHCARD_GENERATOR, flashcard_params(count=count), user_info, []) == (False, None, ["count"])
+
+
+def test_numeric_string_count_is_coerced(user_info):
+    is_valid, tool_input, _ = validate_parameters(ToolType.FLASHCARD_GENERATOR, flashcard_params(count="5"), user_info, [])
+    
+    assert is_valid
+    assert tool_input["count"] == 5
+
+
+def test_invalid_literal_is_reported(user_info):
+    assert validate_parameters(ToolType.FLASHCARD_GENERATOR, flashcard_params(difficulty="insane"), user_info, []) == (False, None, ["difficulty"])
+
+
+def test_non_string_topic_is_reported(user_info):
+    params = {"topic": ["cells", "energy"], "subject": "Biology", "note_taking_style": "outline"}
+    
+    assert validate_parameters(ToolType.NOTE_MAKER, params, user_info, []) == (False, None, ["topic"])
+
+
+def test_missing_params_are_listed_in_order(user_info):
+    params = {"current_topic": "Biology"}
+    
+    assert validate_parameters(ToolType.CONCEPT_EXPLAINER, params, user_info, []) == (False, None, ["concept_to_explain", "desired_depth"])
+
+
+def test_concept_explainer_accepts_database_history(user_info):
+    params = {"concept_to_explain": "osmosis", "current_topic": "Biology", "desired_depth": "basic"}
+    history = [{"role": "user", "content": "What is osmosis?"}]
+    
+    is_valid, tool_input, _ = validate_parameters(ToolType.CONCEPT_EXPLAINER, params, user_info, history)
+    
+    assert is_valid
+    assert tool_input["chat_history"][0]["content"] == "What is osmosis?"
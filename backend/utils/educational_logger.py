@@ -2,7 +2,70 @@
 Educational logging utility for demo purposes.
 Shows detailed, colorful logs explaining what's happening at each step.
 """
+import atexit
+import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Output is queued and written to stdout by a background listener thread,
+# so the event loop never blocks on terminal writes. The thread starts with
+# the first record, so importers that never log (or run with educational
+# logging disabled) don't get one.
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes queued records to stdout; flush markers wake their waiter."""
+    
+    def handle(self, record: logging.LogRecord) -> bool:
+        marker = getattr(record, "flush_marker", None)
+        if marker is not None:
+            self.flush()
+            marker.set()
+            return True
+        return super().handle(record)
+
+
+def _ensure_listener() -> None:
+    """Start the output listener thread if it isn't running yet."""
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            listener = QueueListener(_queue, _StdoutHandler(sys.stdout))
+            listener.start()
+            _listener = listener
+
+
+@atexit.register
+def _stop_listener() -> None:
+    """Write out anything still queued and stop the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+class _LazyQueueHandler(QueueHandler):
+    """QueueHandler that starts the listener with the first record."""
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        _ensure_listener()
+        super().enqueue(record)
+
+
+_output = logging.getLogger("educational")
+_output.setLevel(logging.INFO)
+_output.propagate = False
+_output.addHandler(_LazyQueueHandler(_queue))
 
 
 class Color:
@@ -20,73 +83,129 @@ class Color:
 
 
 class EducationalLogger:
-    """Logger that explains the AI orchestration process."""
+    """
+    Logger that explains the AI orchestration process.
+    
+    Disabled with EDUCATIONAL_LOGGING=false; callers should check `enabled`
+    before building expensive payloads. Each call enqueues one block of
+    text, so multi-line output from concurrent requests never interleaves.
+    """
+    
+    enabled: bool = os.getenv("EDUCATIONAL_LOGGING", "true").lower() == "true"
+    
+    @staticmethod
+    def emit(text: str):
+        """Queue a pre-formatted block of text for output."""
+        if not EducationalLogger.enabled:
+            return
+        _output.info(text)
+    
+    @staticmethod
+    def flush(timeout: float = 5.0):
+        """
+        Block until everything queued so far has been written.
+        
+        Call before printing to stdout directly (e.g. the demo UI) so the
+        queued output doesn't land after or in between.
+        """
+        if _listener is None:
+            return
+        marker = threading.Event()
+        _queue.put_nowait(logging.makeLogRecord({"flush_marker": marker}))
+        marker.wait(timeout)
     
     @staticmethod
     def log_step(emoji: str, title: str, description: str, details: dict = None):
         """Log a major step in the workflow."""
-        print(f"\n{Color.BOLD}{Color.CYAN}{emoji} {title}{Color.RESET}")
-        print(f"{Color.DIM}   → {description}{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        lines = [
+            f"\n{Color.BOLD}{Color.CYAN}{emoji} {title}{Color.RESET}",
+            f"{Color.DIM}   → {description}{Color.RESET}"
+        ]
         
         if details:
-            for key, value in details.items():
-                print(f"{Color.WHITE}   • {key}: {Color.GREEN}{value}{Color.RESET}")
+            lines.extend(
+                f"{Color.WHITE}   • {key}: {Color.GREEN}{value}{Color.RESET}"
+                for key, value in details.items()
+            )
+        _output.info("\n".join(lines))
     
     @staticmethod
     def log_agent(agent_name: str, action: str):
         """Log an agent action."""
-        print(f"{Color.MAGENTA}🤖 {agent_name}{Color.RESET} {Color.DIM}is {action}...{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        _output.info(f"{Color.MAGENTA}🤖 {agent_name}{Color.RESET} {Color.DIM}is {action}...{Color.RESET}")
     
     @staticmethod
     def log_result(result: str, success: bool = True):
         """Log a result."""
+        if not EducationalLogger.enabled:
+            return
         color = Color.GREEN if success else Color.RED
         icon = "✅" if success else "❌"
-        print(f"{color}   {icon} {result}{Color.RESET}")
+        _output.info(f"{color}   {icon} {result}{Color.RESET}")
     
     @staticmethod
     def log_inference(parameter: str, value: str, reason: str):
         """Log parameter inference."""
-        print(f"{Color.YELLOW}   🔮 Inferred {parameter} = '{value}'{Color.RESET}")
-        print(f"{Color.DIM}      Reason: {reason}{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        _output.info(
+            f"{Color.YELLOW}   🔮 Inferred {parameter} = '{value}'{Color.RESET}\n"
+            f"{Color.DIM}      Reason: {reason}{Color.RESET}"
+        )
     
     @staticmethod
     def log_database(action: str, table: str, details: str = ""):
         """Log database operation."""
-        print(f"{Color.BLUE}   💾 Database: {action} → {table}{Color.RESET}", end="")
+        if not EducationalLogger.enabled:
+            return
+        line = f"{Color.BLUE}   💾 Database: {action} → {table}{Color.RESET}"
         if details:
-            print(f" {Color.DIM}({details}){Color.RESET}")
-        else:
-            print()
+            line += f" {Color.DIM}({details}){Color.RESET}"
+        _output.info(line)
     
     @staticmethod
     def log_context(context_type: str, info: str):
         """Log context usage."""
-        print(f"{Color.CYAN}   📚 Using context: {context_type} - {info}{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        _output.info(f"{Color.CYAN}   📚 Using context: {context_type} - {info}{Color.RESET}")
     
     @staticmethod
     def log_validation(field: str, status: str, message: str = ""):
         """Log validation."""
+        if not EducationalLogger.enabled:
+            return
         icon = "✓" if status == "valid" else "⚠"
         color = Color.GREEN if status == "valid" else Color.YELLOW
-        print(f"{color}   {icon} Validating {field}: {status}{Color.RESET}", end="")
+        line = f"{color}   {icon} Validating {field}: {status}{Color.RESET}"
         if message:
-            print(f" {Color.DIM}- {message}{Color.RESET}")
-        else:
-            print()
+            line += f" {Color.DIM}- {message}{Color.RESET}"
+        _output.info(line)
     
     @staticmethod
     def log_tool_call(tool_name: str, endpoint: str):
         """Log tool API call."""
-        print(f"\n{Color.BOLD}{Color.MAGENTA}🔧 Calling Educational Tool:{Color.RESET}")
-        print(f"{Color.WHITE}   Tool: {tool_name}{Color.RESET}")
-        print(f"{Color.DIM}   Endpoint: {endpoint}{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        _output.info(
+            f"\n{Color.BOLD}{Color.MAGENTA}🔧 Calling Educational Tool:{Color.RESET}\n"
+            f"{Color.WHITE}   Tool: {tool_name}{Color.RESET}\n"
+            f"{Color.DIM}   Endpoint: {endpoint}{Color.RESET}"
+        )
     
     @staticmethod
     def log_separator():
         """Print a separator line."""
-        print(f"{Color.DIM}{'─' * 80}{Color.RESET}")
+        if not EducationalLogger.enabled:
+            return
+        _output.info(_SEPARATOR)
+
 
+_SEPARATOR = f"{Color.DIM}{'─' * 80}{Color.RESET}"
 
 # Global instance
 edu_logger = EducationalLogger()
@@ -0,0 +1,55 @@
+"""
+Small in-process TTL cache for memoizing LLM and tool results.
+"""
+import hashlib
+import time
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+import orjson
+
+V = TypeVar("V")
+
+
+def cache_key(*parts: Any) -> str:
+    """Build a stable key from the parts' canonical JSON encoding."""
+    return hashlib.blake2b(
+        orjson.dumps(parts, option=orjson.OPT_SORT_KEYS),
+        digest_size=16
+    ).hexdigest()
+
+
+class TTLCache(Generic[V]):
+    """
+    Bounded cache whose entries expire `ttl` seconds after being stored.
+    
+    When full, expired entries are evicted first, then the oldest one.
+    A ttl of 0 disables the cache (set() stores nothing).
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, V]] = {}
+    
+    def get(self, key: str) -> Optional[V]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return None
+        return value
+    
+    def set(self, key: str, value: V) -> None:
+        """Store a value, evicting expired (then oldest) entries when full."""
+        if self.ttl <= 0:
+            return
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            now = time.monotonic()
+            for stale_key in [k for k, (ts, _) in self._entries.items() if now - ts >= self.ttl]:
+                del self._entries[stale_key]
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic(), value)